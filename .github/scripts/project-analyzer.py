@@ -8,6 +8,8 @@ import ast
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -22,6 +24,23 @@ try:
 except ImportError:
     toml = None
 
+# Directories that never hold project sources; pruned from the file walk
+SKIP_DIRS = {
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+}
+
+# Variable names read through os.environ.get(...) or os.getenv(...)
+ENV_VAR_RE = re.compile(r'os\.(?:environ\.get|getenv)\([\'"]([^\'"]+)[\'"]')
+
+# Threads for reading source files; reads release the GIL, so a few overlap well
+READ_WORKERS = 8
+
 
 class ProjectAnalyzer:
     """Universal project analyzer for CI/CD automation"""
@@ -30,6 +49,33 @@ class ProjectAnalyzer:
         self.project_root = Path(project_root)
         self.analysis = {}
 
+    @cached_property
+    def _requirements_text(self) -> Optional[str]:
+        """requirements.txt contents, read once per analyzer; None when absent"""
+        try:
+            return (self.project_root / "requirements.txt").read_text()
+        except OSError:
+            return None
+
+    @cached_property
+    def _files_by_suffix(self) -> Dict[str, List[Path]]:
+        """Project files by suffix from one pruned walk, not one rglob per pattern"""
+        files: Dict[str, List[Path]] = {}
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                path = Path(dirpath) / name
+                files.setdefault(path.suffix, []).append(path)
+        return files
+
+    @cached_property
+    def _package_json(self) -> Optional[Dict[str, Any]]:
+        """Parsed package.json, read once per analyzer; None when absent"""
+        try:
+            return json.loads((self.project_root / "package.json").read_text())
+        except OSError:
+            return None
+
     def analyze_project(self) -> Dict[str, Any]:
         """Complete project analysis"""
         self.analysis = {
@@ -55,43 +101,41 @@ class ProjectAnalyzer:
         }
 
         # Check for package files
-        if (self.project_root / "package.json").exists():
-            with open(self.project_root / "package.json") as f:
-                data = json.load(f)
-                info.update(
-                    {
-                        "name": data.get("name", "Unknown"),
-                        "type": "Node.js",
-                        "language": "JavaScript/TypeScript",
-                        "version": data.get("version", "Unknown"),
-                    }
-                )
-
-                # Detect framework
-                deps = data.get("dependencies", {})
-                if "react" in deps:
-                    info["framework"] = "React"
-                elif "vue" in deps:
-                    info["framework"] = "Vue"
-                elif "express" in deps:
-                    info["framework"] = "Express"
-                elif "next" in deps:
-                    info["framework"] = "Next.js"
-
-        elif (self.project_root / "requirements.txt").exists():
+        if self._package_json is not None:
+            data = self._package_json
+            info.update(
+                {
+                    "name": data.get("name", "Unknown"),
+                    "type": "Node.js",
+                    "language": "JavaScript/TypeScript",
+                    "version": data.get("version", "Unknown"),
+                }
+            )
+
+            # Detect framework
+            deps = data.get("dependencies", {})
+            if "react" in deps:
+                info["framework"] = "React"
+            elif "vue" in deps:
+                info["framework"] = "Vue"
+            elif "express" in deps:
+                info["framework"] = "Express"
+            elif "next" in deps:
+                info["framework"] = "Next.js"
+
+        elif self._requirements_text is not None:
             info.update({"type": "Python", "language": "Python"})
 
             # Detect framework from requirements
-            with open(self.project_root / "requirements.txt") as f:
-                content = f.read()
-                if "django" in content:
-                    info["framework"] = "Django"
-                elif "flask" in content:
-                    info["framework"] = "Flask"
-                elif "fastapi" in content:
-                    info["framework"] = "FastAPI"
-                elif "streamlit" in content:
-                    info["framework"] = "Streamlit"
+            content = self._requirements_text
+            if "django" in content:
+                info["framework"] = "Django"
+            elif "flask" in content:
+                info["framework"] = "Flask"
+            elif "fastapi" in content:
+                info["framework"] = "FastAPI"
+            elif "streamlit" in content:
+                info["framework"] = "Streamlit"
 
         elif (self.project_root / "pom.xml").exists():
             info.update({"type": "Java", "language": "Java"})
@@ -119,26 +163,24 @@ class ProjectAnalyzer:
         deps = {"python": [], "node": [], "system": [], "database": [], "cloud": []}
 
         # Python dependencies
-        if (self.project_root / "requirements.txt").exists():
-            with open(self.project_root / "requirements.txt") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        package = line.split("==")[0].split(">=")[0].split("<=")[0]
-                        deps["python"].append(package)
-
-                        # Categorize dependencies
-                        if package in ["psycopg2", "mysql-connector", "sqlite3"]:
-                            deps["database"].append(package)
-                        elif package in ["boto3", "google-cloud", "azure"]:
-                            deps["cloud"].append(package)
+        if self._requirements_text is not None:
+            for line in self._requirements_text.splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    package = line.split("==")[0].split(">=")[0].split("<=")[0]
+                    deps["python"].append(package)
+
+                    # Categorize dependencies
+                    if package in ["psycopg2", "mysql-connector", "sqlite3"]:
+                        deps["database"].append(package)
+                    elif package in ["boto3", "google-cloud", "azure"]:
+                        deps["cloud"].append(package)
 
         # Node.js dependencies
-        if (self.project_root / "package.json").exists():
-            with open(self.project_root / "package.json") as f:
-                data = json.load(f)
-                deps["node"].extend(data.get("dependencies", {}).keys())
-                deps["node"].extend(data.get("devDependencies", {}).keys())
+        if self._package_json is not None:
+            data = self._package_json
+            deps["node"].extend(data.get("dependencies", {}).keys())
+            deps["node"].extend(data.get("devDependencies", {}).keys())
 
         # System dependencies (from Dockerfile)
         if (self.project_root / "Dockerfile").exists():
@@ -185,20 +227,20 @@ class ProjectAnalyzer:
                 config["config_files"].append(pattern)
 
         # Extract environment variables from Python files
-        for py_file in self.project_root.rglob("*.py"):
+        def read_env_vars(py_file: Path) -> List[str]:
             try:
                 with open(py_file) as f:
-                    content = f.read()
-                    # Find os.environ.get or os.getenv calls
-                    env_vars = re.findall(
-                        r'os\.environ\.get\([\'"]([^\'"]+)[\'"]', content
-                    )
-                    env_vars.extend(
-                        re.findall(r'os\.getenv\([\'"]([^\'"]+)[\'"]', content)
-                    )
-                    config["environment_variables"].extend(env_vars)
+                    # Find os.environ.get or os.getenv calls in one pass
+                    return ENV_VAR_RE.findall(f.read())
             except:
-                continue
+                return []
+
+        # Overlap the reads; map still yields results in file order
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            for names in executor.map(
+                read_env_vars, self._files_by_suffix.get(".py", [])
+            ):
+                config["environment_variables"].extend(names)
 
         # Common secrets
         common_secrets = [
@@ -228,26 +270,23 @@ class ProjectAnalyzer:
         }
 
         # Python testing
-        if (self.project_root / "requirements.txt").exists():
-            with open(self.project_root / "requirements.txt") as f:
-                content = f.read()
-                if "pytest" in content:
-                    testing["framework"] = "pytest"
-                elif "unittest" in content:
-                    testing["framework"] = "unittest"
+        if self._requirements_text is not None:
+            content = self._requirements_text
+            if "pytest" in content:
+                testing["framework"] = "pytest"
+            elif "unittest" in content:
+                testing["framework"] = "unittest"
 
-                if "coverage" in content:
-                    testing["coverage_tool"] = "coverage"
+            if "coverage" in content:
+                testing["coverage_tool"] = "coverage"
 
         # Node.js testing
-        if (self.project_root / "package.json").exists():
-            with open(self.project_root / "package.json") as f:
-                data = json.load(f)
-                scripts = data.get("scripts", {})
-                if "test" in scripts:
-                    testing["test_commands"].append(f"npm test")
-                if "jest" in scripts:
-                    testing["framework"] = "Jest"
+        if self._package_json is not None:
+            scripts = self._package_json.get("scripts", {})
+            if "test" in scripts:
+                testing["test_commands"].append(f"npm test")
+            if "jest" in scripts:
+                testing["framework"] = "Jest"
 
         # Test directories
         test_dirs = ["tests", "test", "specs", "spec", "__tests__"]
@@ -274,8 +313,8 @@ class ProjectAnalyzer:
             deployment["deployment_files"].append("Dockerfile")
 
         # Kubernetes
-        k8s_files = list(self.project_root.rglob("*.yaml")) + list(
-            self.project_root.rglob("*.yml")
+        k8s_files = self._files_by_suffix.get(".yaml", []) + self._files_by_suffix.get(
+            ".yml", []
         )
         for file in k8s_files:
             if "k8s" in file.name.lower() or "kubernetes" in file.name.lower():
@@ -291,7 +330,7 @@ class ProjectAnalyzer:
             deployment["deployment_files"].append("deploy.sh")
 
         # Infrastructure as Code
-        terraform_files = list(self.project_root.rglob("*.tf"))
+        terraform_files = self._files_by_suffix.get(".tf", [])
         if terraform_files:
             deployment["infrastructure"] = "Terraform"
             deployment["deployment_files"].extend([str(f) for f in terraform_files])
@@ -308,12 +347,10 @@ class ProjectAnalyzer:
         }
 
         # Check for security tools in dependencies
-        if (self.project_root / "requirements.txt").exists():
-            with open(self.project_root / "requirements.txt") as f:
-                content = f.read()
-                if "safety" in content:
-                    security["dependency_checking"] = True
-                    security["security_tools"].append("safety")
+        if self._requirements_text is not None:
+            if "safety" in self._requirements_text:
+                security["dependency_checking"] = True
+                security["security_tools"].append("safety")
 
         # Check for security configuration
         security_files = [".bandit", "bandit.yaml", "safety.yaml"]
@@ -338,17 +375,16 @@ class ProjectAnalyzer:
             database["migrations"] = True
 
         # Check for database dependencies
-        if (self.project_root / "requirements.txt").exists():
-            with open(self.project_root / "requirements.txt") as f:
-                content = f.read()
-                if "sqlalchemy" in content:
-                    database["orm"] = "SQLAlchemy"
-                elif "django" in content:
-                    database["orm"] = "Django ORM"
-                elif "psycopg2" in content:
-                    database["type"] = "PostgreSQL"
-                elif "mysql-connector" in content:
-                    database["type"] = "MySQL"
+        if self._requirements_text is not None:
+            content = self._requirements_text
+            if "sqlalchemy" in content:
+                database["orm"] = "SQLAlchemy"
+            elif "django" in content:
+                database["orm"] = "Django ORM"
+            elif "psycopg2" in content:
+                database["type"] = "PostgreSQL"
+            elif "mysql-connector" in content:
+                database["type"] = "MySQL"
 
         return database
 
@@ -8,8 +8,12 @@ import json
 import os
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+# Threads for reading source files; reads release the GIL, so a few overlap well
+READ_WORKERS = 8
 
 
 class SmartDefaults:
@@ -224,27 +228,44 @@ class SmartDefaults:
 
         found_patterns = {}
 
-        # Search for patterns in Python files
-        for py_file in self.project_root.rglob("*.py"):
+        # One case-insensitive pass per file finds every pattern at once
+        # (no pattern is a substring of another, so non-overlapping matches suffice)
+        pattern_re = re.compile(
+            "|".join(
+                re.escape(pattern)
+                for info in secret_patterns.values()
+                for pattern in info["patterns"]
+            ),
+            re.IGNORECASE,
+        )
+
+        def scan(py_file: Path) -> Optional[Set[str]]:
             try:
                 with open(py_file, "r") as f:
-                    content = f.read()
-
-                    for category, info in secret_patterns.items():
-                        for pattern in info["patterns"]:
-                            if pattern.lower() in content.lower():
-                                if category not in found_patterns:
-                                    found_patterns[category] = []
-                                found_patterns[category].append(
-                                    {
-                                        "pattern": pattern,
-                                        "file": str(py_file),
-                                        "suggestions": info["suggestions"],
-                                    }
-                                )
+                    return {match.lower() for match in pattern_re.findall(f.read())}
             except:
+                return None
+
+        # Search Python files for patterns, overlapping the reads (map keeps order)
+        py_files = list(self.project_root.rglob("*.py"))
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+            scanned = list(executor.map(scan, py_files))
+
+        for py_file, present in zip(py_files, scanned):
+            if present is None:
                 continue
 
+            for category, info in secret_patterns.items():
+                for pattern in info["patterns"]:
+                    if pattern.lower() in present:
+                        found_patterns.setdefault(category, []).append(
+                            {
+                                "pattern": pattern,
+                                "file": str(py_file),
+                                "suggestions": info["suggestions"],
+                            }
+                        )
+
         return found_patterns
 
     def generate_suggestions(self) -> Dict[str, Any]:
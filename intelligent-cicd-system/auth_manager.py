@@ -4,11 +4,137 @@
 Manages GCP and GitHub authentication with state management
 """
 
+import asyncio
+import configparser
+import functools
+import os
 import subprocess
-import re
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+from gcloud_env import (
+    GCLOUD,
+    GCLOUD_ENV,
+    GCLOUD_SPAWN_OPTIONS,
+    GCLOUD_TIMEOUT,
+    read_credentials_file,
+)
+from github_api import GH
 from state_manager import StateManager
 
+try:
+    import google.auth
+    from google.auth.exceptions import DefaultCredentialsError, GoogleAuthError
+except (
+    ImportError
+):  # google-auth is optional; the gcloud config file covers the common case
+    google = None
+
+try:
+    from google.auth.transport.requests import Request
+except ImportError:  # token refresh needs requests; without it gcloud is asked instead
+    Request = None
+
+
+def read_gcloud_project() -> Optional[str]:
+    """Read core/project from the active gcloud configuration file"""
+    config_dir = Path(
+        os.environ.get('CLOUDSDK_CONFIG', Path.home() / '.config' / 'gcloud')
+    )
+    try:
+        active_config = (config_dir / 'active_config').read_text().strip() or 'default'
+    except OSError:
+        active_config = 'default'
+    
+    parser = configparser.ConfigParser()
+    if not parser.read(config_dir / 'configurations' / f'config_{active_config}'):
+        return None
+    return parser.get('core', 'project', fallback=None) or None
+
+
+def detect_gcp_project() -> Optional[str]:
+    """Resolve the GCP project in-process, without spawning gcloud"""
+    project_id = os.environ.get('CLOUDSDK_CORE_PROJECT') or read_gcloud_project()
+    if project_id or google is None:
+        return project_id
+    
+    try:
+        _, project_id = google.auth.default()
+    except DefaultCredentialsError:
+        return None
+    return project_id
+
+
+def gcp_credentials_valid() -> Optional[bool]:
+    """Check Application Default Credentials in-process; None if google-auth can't tell.
+    
+    Only True is conclusive: expired or unreachable ADC says nothing about a separate
+    `gcloud auth login`, so callers fall back to gcloud on anything else.
+    """
+    if google is None or Request is None:
+        return None
+    
+    try:
+        credentials, _ = google.auth.default()
+        if not credentials.valid:
+            # Bounded like the gcloud probes; the transport's own default is two minutes
+            credentials.refresh(functools.partial(Request(), timeout=GCLOUD_TIMEOUT))
+    except DefaultCredentialsError:
+        return None  # No ADC; a plain `gcloud auth login` may still be active
+    except GoogleAuthError:
+        return False  # Refresh or transport failure
+    return True
+
+
+async def _run(*argv: str) -> Tuple[int, bytes, bytes]:
+    """Run a CLI command off the event loop, killed after GCLOUD_TIMEOUT seconds"""
+    proc = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        close_fds=False, env=GCLOUD_ENV if argv[0] == GCLOUD else None
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate(), timeout=GCLOUD_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout, stderr
+
+
+def _stdout_if_ok(
+    result: Union[Tuple[int, bytes, bytes], BaseException],
+) -> Optional[str]:
+    """Decoded stdout of a successful _run() result, None on failure"""
+    if isinstance(result, BaseException) or result[0] != 0:
+        return None
+    return result[1].decode('utf-8', 'replace')
+
+
+# Machine-readable probes: bare account names from gcloud and a bare login from gh,
+# nothing to scrape
+GCLOUD_ACTIVE_ACCOUNTS = (
+    GCLOUD,
+    'auth',
+    'list',
+    '--filter=status:ACTIVE',
+    '--format=value(account)',
+)
+GH_LOGIN = (GH, 'api', 'user', '--jq', '.login')
+
+
+def _env_github_user() -> Optional[str]:
+    """User for a token provided through the environment (CI), or None"""
+    if not (os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN')):
+        return None
+    return os.environ.get('GITHUB_ACTOR') or 'Unknown'
+
+
+def _has_active_account(output: Optional[str]) -> bool:
+    """Whether GCLOUD_ACTIVE_ACCOUNTS output lists an account"""
+    # One account per line; only presence matters, so there is nothing to parse
+    return bool(output and output.strip())
+
 class AuthManager:
     """Manages authentication for GCP and GitHub"""
     
@@ -75,11 +201,49 @@ class AuthManager:
     
     def get_current_auth_status(self) -> Dict[str, Any]:
         """Get current authentication status without updating state"""
+        return asyncio.run(self._get_current_auth_status_async())
+    
+    async def _get_current_auth_status_async(self) -> Dict[str, Any]:
+        """Run the GCP and gh probes concurrently and merge their results"""
+        # A GitHub token from the environment (CI) needs no probe; a credentials file
+        # only names the project, since gcloud does not authenticate with it
+        credentials_file = read_credentials_file()
+        env_github_user = _env_github_user()
+        
+        # Only the probes that are needed, side by side
+        probes = {'gcp': asyncio.to_thread(gcp_credentials_valid)}
+        if not env_github_user:
+            probes['github'] = _run(*GH_LOGIN)
+        results = await asyncio.gather(*probes.values(), return_exceptions=True)
+        results = dict(zip(probes, results))
+        gcp_authenticated = results['gcp']
+        github_auth = results.get('github')
+        
+        # Valid ADC is conclusive; otherwise ask gcloud, which every later step runs as
+        if gcp_authenticated is not True:
+            try:
+                gcp_auth = await _run(*GCLOUD_ACTIVE_ACCOUNTS)
+            except (OSError, asyncio.TimeoutError):
+                gcp_authenticated = False
+            else:
+                gcp_authenticated = _has_active_account(_stdout_if_ok(gcp_auth))
+        
+        github_user = (
+            env_github_user or (_stdout_if_ok(github_auth) or '').strip() or None
+        )
+        github_authenticated = github_user is not None
+        
+        project_id = None
+        if gcp_authenticated:
+            project_id = (credentials_file or {}).get(
+                'project_id'
+            ) or detect_gcp_project()
+        
         return {
-            'gcp_authenticated': self._check_gcp_auth(),
-            'github_authenticated': self._check_github_auth(),
-            'gcp_project': self._get_gcp_project() if self._check_gcp_auth() else None,
-            'github_user': self._get_github_user() if self._check_github_auth() else None
+            'gcp_authenticated': gcp_authenticated,
+            'github_authenticated': github_authenticated,
+            'gcp_project': project_id,
+            'github_user': github_user
         }
     
     def check_gcp_auth(self) -> bool:
@@ -92,43 +256,49 @@ class AuthManager:
     
     def _check_gcp_auth(self) -> bool:
         """Check if GCP is authenticated"""
+        # Valid ADC is conclusive; otherwise ask gcloud, which every later step runs as
+        if gcp_credentials_valid():
+            return True
+        
         try:
-            result = subprocess.run(['gcloud', 'auth', 'list'], 
-                                 capture_output=True, text=True, check=True)
-            return 'ACTIVE' in result.stdout
-        except:
+            result = subprocess.run(
+                GCLOUD_ACTIVE_ACCOUNTS,
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_TIMEOUT,
+            )
+            return _has_active_account(result.stdout)
+        except (OSError, subprocess.SubprocessError):
             return False
     
     def _check_github_auth(self) -> bool:
         """Check if GitHub is authenticated"""
-        try:
-            result = subprocess.run(['gh', 'auth', 'status'], 
-                                 capture_output=True, text=True, check=True)
-            return 'Logged in to github.com' in result.stdout
-        except:
-            return False
+        return self._get_github_user() is not None
     
     def _get_gcp_project(self) -> Optional[str]:
         """Get current GCP project ID"""
         try:
-            result = subprocess.run(['gcloud', 'config', 'get-value', 'project'], 
-                                 capture_output=True, text=True, check=True)
-            project_id = result.stdout.strip()
-            return project_id if project_id else None
+            return detect_gcp_project()
         except:
             return None
     
     def _get_github_user(self) -> Optional[str]:
         """Get current GitHub username"""
+        env_github_user = _env_github_user()
+        if env_github_user:
+            return env_github_user
+        
         try:
-            result = subprocess.run(['gh', 'auth', 'status'], 
-                                 capture_output=True, text=True, check=True)
-            
-            if 'Logged in to github.com' in result.stdout:
-                username_match = re.search(r'as (\w+)', result.stdout)
-                return username_match.group(1) if username_match else 'Unknown'
-            
-            return None
+            result = subprocess.run(
+                GH_LOGIN,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=GCLOUD_TIMEOUT,
+            )
+            return result.stdout.strip() or None
         except:
             return None
     
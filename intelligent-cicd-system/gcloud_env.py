@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+☁️ gcloud Environment
+Child-process environment and shared helpers for non-interactive gcloud invocations
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+# Skip the per-invocation component update check and never block on a prompt.
+# Only passed to gcloud children; the toolbox's own environment is untouched.
+GCLOUD_ENV = {
+    **os.environ,
+    'CLOUDSDK_COMPONENT_MANAGER_DISABLE_UPDATE_CHECK': '1',
+    'CLOUDSDK_CORE_DISABLE_PROMPTS': '1',
+}
+
+# Resolved once so each spawn skips the PATH search; the bare name keeps the usual
+# FileNotFoundError when gcloud is not installed
+GCLOUD = shutil.which('gcloud') or 'gcloud'
+
+# Keyword arguments for every gcloud spawn. With close_fds=False and the absolute
+# GCLOUD path, CPython starts the child with posix_spawn instead of fork plus a
+# close() sweep over the fd table; descriptors Python opens are non-inheritable
+# (PEP 446), so none leak into gcloud
+GCLOUD_SPAWN_OPTIONS = {'env': GCLOUD_ENV, 'close_fds': False}
+
+
+def read_credentials_file() -> Optional[Dict[str, Any]]:
+    """GOOGLE_APPLICATION_CREDENTIALS identity, or None when unset or unreadable"""
+    path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if not path or not os.path.isfile(path):
+        return None
+    return _load_credentials_file(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=4)
+def _load_credentials_file(path: str, mtime: float) -> Optional[Dict[str, Any]]:
+    """Parse a credentials file once per path and mtime, keeping non-secret fields"""
+    try:
+        with open(path) as f:
+            credentials = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(credentials, dict) or 'type' not in credentials:
+        return None
+    return {
+        'type': credentials['type'],
+        'client_email': credentials.get('client_email'),
+        'project_id': credentials.get('project_id')
+        or credentials.get('quota_project_id'),
+    }
+
+
+# Upper bounds so a wedged gcloud (network stall, hidden prompt) cannot hang the app:
+# quick reads, and calls that wait on a long-running operation
+GCLOUD_TIMEOUT = 30
+GCLOUD_OPERATION_TIMEOUT = 300
+
+# Concurrent gcloud calls per fan-out; more mostly trades wall time for 429 retries
+GCLOUD_MAX_CONCURRENCY = 4
+
+# Attempts at the policy read-modify-write before giving up on etag conflicts
+IAM_POLICY_ATTEMPTS = 3
+
+
+def add_policy_bindings(policy: Dict[str, Any], member: str, roles: List[str]) -> bool:
+    """Add member to each role's unconditional binding in place; False if unchanged"""
+    bindings = policy.setdefault('bindings', [])
+    changed = False
+    for role in roles:
+        binding = next(
+            (b for b in bindings if b['role'] == role and 'condition' not in b), None
+        )
+        if binding is None:
+            bindings.append({'role': role, 'members': [member]})
+            changed = True
+        elif member not in binding['members']:
+            binding['members'].append(member)
+            changed = True
+    return changed
+
+
+def add_project_iam_bindings(
+    project_id: str, member: str, roles: List[str]
+) -> Optional[str]:
+    """Grant project roles with one policy read and write; error message or None"""
+    error = None
+    for _ in range(IAM_POLICY_ATTEMPTS):
+        result = subprocess.run(
+            [GCLOUD, 'projects', 'get-iam-policy', project_id, '--format=json'],
+            capture_output=True,
+            text=True,
+            **GCLOUD_SPAWN_OPTIONS,
+            timeout=GCLOUD_TIMEOUT,
+        )
+        if result.returncode != 0:
+            return result.stderr.strip()
+
+        policy = json.loads(result.stdout)
+        if not add_policy_bindings(policy, member, roles):
+            return None
+
+        with tempfile.NamedTemporaryFile(
+            'w', suffix='.json', delete=False
+        ) as policy_file:
+            json.dump(policy, policy_file)
+        try:
+            result = subprocess.run(
+                [
+                    GCLOUD,
+                    'projects',
+                    'set-iam-policy',
+                    project_id,
+                    policy_file.name,
+                    '--format=none',
+                ],
+                capture_output=True,
+                text=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_OPERATION_TIMEOUT,
+            )
+        finally:
+            os.unlink(policy_file.name)
+
+        if result.returncode == 0:
+            return None
+        error = result.stderr.strip()
+        # The etag guards against lost updates; re-read and retry if another write won
+        if 'etag' not in error.lower() and 'concurrent' not in error.lower():
+            return error
+    return error
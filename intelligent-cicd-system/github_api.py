@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+🐙 GitHub API
+Shared GitHub access for the CI/CD system
+"""
+
+import asyncio
+import base64
+import os
+import shutil
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from gcloud_env import GCLOUD_TIMEOUT
+
+try:
+    import requests
+except ImportError:  # requests is optional; callers fall back to the gh CLI
+    requests = None
+
+try:
+    from nacl import encoding, public
+except ImportError:  # PyNaCl is optional; secrets fall back to the gh CLI
+    public = None
+
+# Sealing Actions secrets over REST needs both requests and PyNaCl
+SECRETS_AVAILABLE = requests is not None and public is not None
+
+API_URL = 'https://api.github.com'
+
+# Resolved once so each spawn skips the PATH search
+GH = shutil.which('gh') or 'gh'
+GIT = shutil.which('git') or 'git'
+
+# git children fail instead of waiting on a username/password prompt nobody can
+# answer, and a push stuck on the network is abandoned after GIT_PUSH_TIMEOUT
+GIT_ENV = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+GIT_PUSH_TIMEOUT = 120
+
+
+def get_github_token() -> Optional[str]:
+    """Get a GitHub token from the environment or the gh CLI login"""
+    token = os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN')
+    if token:
+        return token
+
+    try:
+        result = subprocess.run(
+            [GH, 'auth', 'token'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=GCLOUD_TIMEOUT,
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class GitHubAPI:
+    """Keep-alive GitHub REST session"""
+
+    def __init__(self, token: str):
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                'Authorization': f'Bearer {token}',
+                'Accept': 'application/vnd.github+json',
+                'X-GitHub-Api-Version': '2022-11-28',
+            }
+        )
+
+    def get_json(self, path: str, **params) -> Any:
+        """GET a JSON resource"""
+        response = self.session.get(f'{API_URL}{path}', params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def set_secrets(
+        self, repo_name: str, secrets: Dict[str, str]
+    ) -> Dict[str, Optional[str]]:
+        """Seal and store Actions secrets with one public-key fetch; maps name -> error or None"""
+        key = self.get_json(f'/repos/{repo_name}/actions/secrets/public-key')
+        sealed_box = public.SealedBox(
+            public.PublicKey(key['key'].encode(), encoding.Base64Encoder())
+        )
+
+        def put(name: str, value: str) -> Optional[str]:
+            payload = {
+                'encrypted_value': base64.b64encode(
+                    sealed_box.encrypt(value.encode())
+                ).decode(),
+                'key_id': key['key_id'],
+            }
+            response = self.session.put(
+                f'{API_URL}/repos/{repo_name}/actions/secrets/{name}',
+                json=payload,
+                timeout=10,
+            )
+            return None if response.ok else f"{response.status_code} {response.text}"
+
+        # Overlap the PUT round-trips; the session's pool runs them in parallel
+        async def put_all() -> List[Optional[str]]:
+            return await asyncio.gather(
+                *(
+                    asyncio.to_thread(put, name, value)
+                    for name, value in secrets.items()
+                )
+            )
+
+        return dict(zip(secrets, asyncio.run(put_all())))
@@ -4,24 +4,64 @@
 Manages GCP infrastructure setup with proper state management
 """
 
+import asyncio
 import subprocess
 import time
 import re
-from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple, Any
 from state_manager import StateManager
+from auth_manager import detect_gcp_project
+from gcloud_env import (
+    GCLOUD,
+    GCLOUD_OPERATION_TIMEOUT,
+    GCLOUD_SPAWN_OPTIONS,
+    GCLOUD_TIMEOUT,
+    IAM_POLICY_ATTEMPTS,
+    add_policy_bindings,
+    add_project_iam_bindings,
+)
+import result_cache
+
+try:
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession, Request
+except ImportError:  # google-auth[requests] is optional; probes fall back to gcloud
+    AuthorizedSession = None
+
+CLOUD_PLATFORM_SCOPE = 'https://www.googleapis.com/auth/cloud-platform'
+
+# Seconds a completed setup is trusted across restarts before it is verified again
+SETUP_CACHE_TTL = 24 * 60 * 60
 
 class InfrastructureManager:
     """Manages GCP infrastructure setup with proper state flow"""
     
+    ARTIFACT_REPOSITORY = "neurogent-repo"
+    ARTIFACT_LOCATION = "us-central1"
+    
     def __init__(self, state_manager: StateManager):
         self.state_manager = state_manager
-        self.project_id = None
-        self.service_account_email = None
-        self.workload_identity_pool = None
-        self.workload_identity_provider = None
     
-    def setup_infrastructure(self) -> bool:
-        """Setup complete GCP infrastructure with proper state management"""
+    # The manager is shared across sessions, so per-user values live in session state
+    @property
+    def project_id(self) -> Optional[str]:
+        return self.state_manager.get_infrastructure_state()['project_id']
+    
+    @property
+    def service_account_email(self) -> Optional[str]:
+        return self.state_manager.get_infrastructure_state()['service_account_email']
+    
+    @property
+    def workload_identity_pool(self) -> Optional[str]:
+        return self.state_manager.get_infrastructure_state()['wif_pool']
+    
+    @property
+    def workload_identity_provider(self) -> Optional[str]:
+        return self.state_manager.get_infrastructure_state()['wif_provider']
+    
+    def setup_infrastructure(self, force: bool = False) -> bool:
+        """Setup complete GCP infrastructure; force re-checks an earlier run's setup"""
         try:
             print("🏗️ Starting GCP infrastructure setup...")
             
@@ -30,33 +70,62 @@ class InfrastructureManager:
                 self.state_manager.set_error("Failed to setup project ID", "infrastructure")
                 return False
             
-            # Step 2: Setup Service Account
-            if not self._setup_service_account():
-                self.state_manager.set_error("Failed to setup service account", "infrastructure")
+            # Every step is idempotent, so a recent success for this project is reused
+            cache_key = result_cache.make_key('infrastructure', self.project_id)
+            saved = None if force else result_cache.load(cache_key)
+            if saved and time.time() - saved['ts'] < SETUP_CACHE_TTL:
+                self.state_manager.update_infrastructure_state(**saved['state'])
+                print(f"♻️ Reusing infrastructure setup from {time.ctime(saved['ts'])}")
+                return True
+            
+            # The manager is shared across sessions, so this run's REST session and
+            # probe results stay local and are handed to each step
+            project_id = self.project_id
+            session = self._create_rest_session()
+            existing = self._probe_existing_resources(project_id, session)
+            
+            # Independent steps run on the shared pool. Workers have no Streamlit script
+            # context, so they take plain values and return state updates to this thread
+            executor = self.state_manager.get_executor()
+            
+            # Steps 2 and 3: the service account and the APIs are independent
+            service_account = executor.submit(
+                self._setup_service_account, project_id, session
+            )
+            apis = executor.submit(self._enable_required_apis, project_id,
+                                   existing.get('enabled_apis'), session)
+            if not self._record_step(
+                service_account, "Failed to setup service account"
+            ):
                 return False
-            
-            # Step 3: Enable Required APIs
-            if not self._enable_required_apis():
-                self.state_manager.set_error("Failed to enable required APIs", "infrastructure")
+            if not self._record_step(apis, "Failed to enable required APIs"):
                 return False
             
-            # Step 4: Setup Workload Identity Federation
-            if not self._setup_workload_identity_federation():
-                self.state_manager.set_error("Failed to setup Workload Identity Federation", "infrastructure")
+            # Steps 4 and 6: WIF and Artifact Registry need the APIs but not each other
+            wif = executor.submit(
+                self._setup_workload_identity_federation, project_id, session
+            )
+            registry = executor.submit(self._setup_artifact_registry, project_id,
+                                       existing.get('artifact_registry'), session)
+            if not self._record_step(
+                wif, "Failed to setup Workload Identity Federation"
+            ):
                 return False
             
-            # Step 5: Configure IAM Permissions
-            if not self._configure_iam_permissions():
+            # Step 5: Configure IAM Permissions (needs the service account and pool)
+            if not self._configure_iam_permissions(session):
                 self.state_manager.set_error("Failed to configure IAM permissions", "infrastructure")
                 return False
             
-            # Step 6: Setup Artifact Registry
-            if not self._setup_artifact_registry():
-                self.state_manager.set_error("Failed to setup Artifact Registry", "infrastructure")
+            if not self._record_step(registry, "Failed to setup Artifact Registry"):
                 return False
             
             # Mark infrastructure as complete
             self.state_manager.update_infrastructure_state(setup_complete=True)
+            result_cache.store(cache_key, {
+                'ts': time.time(),
+                'state': dict(self.state_manager.get_infrastructure_state())
+            })
             print("🎉 GCP infrastructure setup completed successfully!")
             return True
             
@@ -66,6 +135,15 @@ class InfrastructureManager:
             print(f"❌ {error_msg}")
             return False
     
+    def _record_step(self, future: Future, error: str) -> bool:
+        """Apply a step's state updates on the script thread; None means it failed"""
+        updates = future.result()
+        if updates is None:
+            self.state_manager.set_error(error, "infrastructure")
+            return False
+        self.state_manager.update_infrastructure_state(**updates)
+        return True
+    
     def _setup_project_id(self) -> bool:
         """Setup project ID and store in state"""
         try:
@@ -77,8 +155,7 @@ class InfrastructureManager:
                 print("❌ No GCP project ID found")
                 return False
             
-            # Store in both local state and session state
-            self.project_id = project_id
+            # Store in session state
             self.state_manager.update_infrastructure_state(project_id=project_id)
             
             print(f"✅ GCP Project ID: {project_id}")
@@ -88,89 +165,101 @@ class InfrastructureManager:
             print(f"❌ Failed to setup project ID: {e}")
             return False
     
-    def _setup_service_account(self) -> bool:
-        """Setup service account and store in state"""
+    def _setup_service_account(
+        self, project_id: str, session: Optional['AuthorizedSession']
+    ) -> Optional[Dict[str, Any]]:
+        """Setup service account; returns its state updates, or None on failure"""
         try:
             print("👤 Setting up CI/CD service account...")
             
-            if not self.project_id:
+            if not project_id:
                 print("❌ Project ID not available")
-                return False
+                return None
             
-            service_account_email = f"cicd-service-account@{self.project_id}.iam.gserviceaccount.com"
-            
-            # Check if service account exists
-            if self._check_service_account_exists(service_account_email):
-                print(f"✅ Service account already exists: {service_account_email}")
-            else:
-                # Create service account
-                print(f"🏗️ Creating service account: {service_account_email}")
-                if not self._create_service_account(service_account_email):
-                    return False
+            service_account_email = self._get_service_account_email(project_id)
             
-            # Store in both local state and session state
-            self.service_account_email = service_account_email
-            self.state_manager.update_infrastructure_state(service_account_email=service_account_email)
+            # Create outright; an existing account is reported as a conflict and counts
+            # as success, so no separate existence check is needed
+            print(f"🏗️ Ensuring service account: {service_account_email}")
+            if not self._create_service_account(
+                service_account_email, project_id, session
+            ):
+                return None
             
             print(f"✅ Service account configured: {service_account_email}")
-            return True
+            return {'service_account_email': service_account_email}
             
         except Exception as e:
             print(f"❌ Failed to setup service account: {e}")
-            return False
+            return None
     
-    def _enable_required_apis(self) -> bool:
-        """Enable required GCP APIs and store status in state"""
+    def _enable_required_apis(
+        self,
+        project_id: str,
+        enabled: Optional[Set[str]],
+        session: Optional['AuthorizedSession'],
+    ) -> Optional[Dict[str, Any]]:
+        """Enable required GCP APIs; the enabled list as a state update, or None"""
         try:
             print("🔌 Enabling required GCP APIs...")
             
             required_apis = [
-                'cloudrun.googleapis.com',
+                'run.googleapis.com',
                 'iam.googleapis.com',
                 'artifactregistry.googleapis.com',
                 'cloudbuild.googleapis.com'
             ]
             
-            enabled_apis = []
+            # One listing call tells us which APIs still need enabling
+            if enabled is None:
+                enabled = self._list_enabled_apis()
+            missing_apis = [api for api in required_apis if api not in enabled]
             
             for api in required_apis:
-                try:
-                    if self._check_api_enabled(api):
-                        print(f"✅ {api}: Already enabled")
-                        enabled_apis.append(api)
+                if api in enabled:
+                    print(f"✅ {api}: Already enabled")
+            
+            if missing_apis:
+                print(f"🔌 Enabling {', '.join(missing_apis)}...")
+                if self._enable_apis(missing_apis, project_id, session):
+                    enabled.update(missing_apis)
+                else:
+                    # The batch is all-or-nothing; retry one by one to keep what we can.
+                    # This step already runs on the shared pool, so waiting on that pool
+                    # from here could deadlock; the retries get their own small one
+                    with ThreadPoolExecutor(max_workers=len(missing_apis)) as pool:
+                        results = list(pool.map(
+                            lambda api: self._enable_api(api, project_id, session),
+                            missing_apis,
+                        ))
+                    enabled.update(api for api, ok in zip(missing_apis, results) if ok)
+                
+                for api in missing_apis:
+                    if api in enabled:
+                        print(f"✅ {api}: Enabled successfully")
                     else:
-                        print(f"🔌 Enabling {api}...")
-                        if self._enable_api(api):
-                            print(f"✅ {api}: Enabled successfully")
-                            enabled_apis.append(api)
-                        else:
-                            print(f"⚠️ {api}: Failed to enable (may need admin access)")
-                except Exception as e:
-                    print(f"⚠️ {api}: Error - {e}")
-            
-            # Store enabled APIs in state
-            self.state_manager.update_infrastructure_state(apis_enabled=enabled_apis)
+                        print(f"⚠️ {api}: Failed to enable (may need admin access)")
+            
+            enabled_apis = [api for api in required_apis if api in enabled]
             
             print(f"✅ APIs configured: {len(enabled_apis)}/{len(required_apis)} enabled")
-            return True
+            return {'apis_enabled': enabled_apis}
             
         except Exception as e:
             print(f"❌ Failed to enable APIs: {e}")
-            return False
+            return None
     
-    def _setup_workload_identity_federation(self) -> bool:
-        """Setup Workload Identity Federation and store in state"""
+    def _setup_workload_identity_federation(
+        self, project_id: str, session: Optional['AuthorizedSession']
+    ) -> Optional[Dict[str, Any]]:
+        """Setup Workload Identity Federation; the pool and provider as state updates"""
         try:
             print("🔗 Setting up Workload Identity Federation...")
             
             # Validate prerequisites
-            if not self.project_id:
+            if not project_id:
                 print("❌ Project ID not available")
-                return False
-            
-            if not self.service_account_email:
-                print("❌ Service account not available")
-                return False
+                return None
             
             # Generate unique names
             timestamp = int(time.time())
@@ -179,31 +268,26 @@ class InfrastructureManager:
             
             # Create the pool
             print(f"🏊 Creating WIF pool: {pool_name}")
-            if not self._create_wif_pool(pool_name):
-                return False
+            if not self._create_wif_pool(pool_name, project_id, session):
+                return None
             
             # Create the provider
             print(f"🔌 Creating WIF provider: {provider_name}")
-            if not self._create_wif_provider(pool_name, provider_name):
-                return False
-            
-            # Store in both local state and session state
-            self.workload_identity_pool = pool_name
-            self.workload_identity_provider = provider_name
-            
-            self.state_manager.update_infrastructure_state(
-                wif_pool=pool_name,
-                wif_provider=provider_name
-            )
+            if not self._create_wif_provider(
+                pool_name, provider_name, project_id, session
+            ):
+                return None
             
             print(f"✅ WIF configured: {pool_name} + {provider_name}")
-            return True
+            return {'wif_pool': pool_name, 'wif_provider': provider_name}
             
         except Exception as e:
             print(f"❌ Failed to setup WIF: {e}")
-            return False
+            return None
     
-    def _configure_iam_permissions(self) -> bool:
+    def _configure_iam_permissions(
+        self, session: Optional['AuthorizedSession']
+    ) -> bool:
         """Configure IAM permissions using stored state"""
         try:
             print("🔐 Configuring IAM permissions...")
@@ -234,14 +318,16 @@ class InfrastructureManager:
                 'roles/cloudbuild.builds.builder'
             ]
             
-            for role in required_roles:
-                print(f"🔑 Adding role: {role}")
-                if not self._add_iam_role(role):
-                    print(f"⚠️ Failed to add role: {role}")
+            # One policy read-modify-write covers every role
+            print(f"🔑 Adding roles: {', '.join(required_roles)}")
+            if not self._add_iam_roles(
+                required_roles, self.project_id, self.service_account_email, session
+            ):
+                print(f"⚠️ Failed to add roles: {', '.join(required_roles)}")
             
             # Configure workload identity binding
             print("🔗 Configuring workload identity binding...")
-            if not self._configure_workload_identity_binding():
+            if not self._configure_workload_identity_binding(session):
                 return False
             
             # Mark IAM as configured
@@ -254,176 +340,543 @@ class InfrastructureManager:
             print(f"❌ Failed to configure IAM: {e}")
             return False
     
-    def _setup_artifact_registry(self) -> bool:
-        """Setup Artifact Registry and store in state"""
+    def _setup_artifact_registry(
+        self,
+        project_id: str,
+        exists: Optional[bool],
+        session: Optional['AuthorizedSession'],
+    ) -> Optional[Dict[str, Any]]:
+        """Setup Artifact Registry; the repository as a state update, or None"""
         try:
             print("🐳 Setting up Artifact Registry...")
             
-            if not self.project_id:
+            if not project_id:
                 print("❌ Project ID not available")
-                return False
+                return None
             
-            repository_name = "neurogent-repo"
-            location = "us-central1"
+            repository_name = self.ARTIFACT_REPOSITORY
+            location = self.ARTIFACT_LOCATION
             
             # Check if repository exists
-            if self._check_artifact_registry_exists(repository_name, location):
+            if exists is None:
+                exists = self._check_artifact_registry_exists(repository_name, location)
+            if exists:
                 print(f"✅ Artifact Registry already exists: {repository_name}")
             else:
                 # Create repository
                 print(f"🏗️ Creating Artifact Registry: {repository_name}")
-                if not self._create_artifact_registry(repository_name, location):
-                    return False
-            
-            # Store in state
-            self.state_manager.update_infrastructure_state(artifact_registry=repository_name)
+                if not self._create_artifact_registry(
+                    repository_name, location, project_id, session
+                ):
+                    return None
             
             print(f"✅ Artifact Registry configured: {repository_name}")
-            return True
+            return {'artifact_registry': repository_name}
             
         except Exception as e:
             print(f"❌ Failed to setup Artifact Registry: {e}")
-            return False
+            return None
     
     # Helper methods
+    def _get_service_account_email(self, project_id: str) -> str:
+        """Email of the CI/CD service account for a project"""
+        return f"cicd-service-account@{project_id}.iam.gserviceaccount.com"
+    
+    def _create_rest_session(self) -> Optional['AuthorizedSession']:
+        """Google API session for one setup run; None without google-auth or ADC"""
+        if AuthorizedSession is None:
+            return None
+        try:
+            credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+            # Refresh once up front so concurrent requests do not each refresh the token
+            credentials.refresh(Request())
+            return AuthorizedSession(credentials)
+        except Exception as e:
+            print(f"⚠️ Google REST APIs unavailable, using gcloud: {e}")
+            return None
+    
+    def _probe_existing_resources(
+        self, project_id: str, session: Optional['AuthorizedSession']
+    ) -> Dict[str, Any]:
+        """Run the read-only existence probes concurrently rather than one by one"""
+        if session is not None:
+            try:
+                return asyncio.run(
+                    self._probe_existing_resources_rest(session, project_id)
+                )
+            except Exception as e:
+                print(f"⚠️ REST probes unavailable, falling back to gcloud: {e}")
+        
+        executor = self.state_manager.get_executor()
+        futures = {
+            'enabled_apis': executor.submit(self._list_enabled_apis),
+            'artifact_registry': executor.submit(
+                self._check_artifact_registry_exists,
+                self.ARTIFACT_REPOSITORY,
+                self.ARTIFACT_LOCATION,
+            ),
+        }
+        return {name: future.result() for name, future in futures.items()}
+    
     def _get_project_id_from_cli(self) -> Optional[str]:
         """Get project ID using CLI commands"""
         try:
-            # Try multiple methods
-            methods = [
-                ['gcloud', 'config', 'get-value', 'project'],
-                ['gcloud', 'config', 'list', '--format', 'value(core.project)'],
-                ['gcloud', 'projects', 'list', '--format', 'value(projectId)', '--limit', '1']
-            ]
-            
-            for method in methods:
-                try:
-                    result = subprocess.run(method, capture_output=True, text=True, check=True)
-                    project_id = result.stdout.strip()
-                    if project_id:
-                        return project_id
-                except:
-                    continue
-            
-            return None
+            # Configured project first, read in-process
+            project_id = detect_gcp_project()
+            if project_id:
+                return project_id
+            
+            # Fall back to the first project the account can see
+            result = subprocess.run(
+                [
+                    GCLOUD,
+                    'projects',
+                    'list',
+                    '--format',
+                    'value(projectId)',
+                    '--limit',
+                    '1',
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_TIMEOUT,
+            )
+            return result.stdout.strip() or None
         except:
             return None
     
-    def _check_service_account_exists(self, email: str) -> bool:
-        """Check if service account exists"""
-        try:
-            subprocess.run(['gcloud', 'iam', 'service-accounts', 'describe', email], 
-                         capture_output=True, text=True, check=True)
-            return True
-        except:
-            return False
+    async def _probe_existing_resources_rest(
+        self, session: 'AuthorizedSession', project_id: str
+    ) -> Dict[str, Any]:
+        """Probe the Google REST APIs with one set of credentials, skipping gcloud"""
+        def exists(url: str) -> bool:
+            return session.get(url, timeout=10).ok
+        
+        def list_enabled_apis() -> Set[str]:
+            url = (
+                f'https://serviceusage.googleapis.com/v1/projects/{project_id}/services'
+            )
+            params = {'filter': 'state:ENABLED', 'pageSize': 200}
+            enabled = set()
+            while True:
+                response = session.get(url, params=params, timeout=10)
+                if not response.ok:
+                    return enabled
+                data = response.json()
+                enabled.update(
+                    service['config']['name'] for service in data.get('services', [])
+                )
+                if not data.get('nextPageToken'):
+                    return enabled
+                params['pageToken'] = data['nextPageToken']
+        
+        enabled_apis, artifact_registry = await asyncio.gather(
+            asyncio.to_thread(list_enabled_apis),
+            asyncio.to_thread(
+                exists,
+                f'https://artifactregistry.googleapis.com/v1/projects/{project_id}'
+                f'/locations/{self.ARTIFACT_LOCATION}'
+                f'/repositories/{self.ARTIFACT_REPOSITORY}',
+            ),
+        )
+        return {
+            'enabled_apis': enabled_apis,
+            'artifact_registry': artifact_registry
+        }
     
-    def _create_service_account(self, email: str) -> bool:
-        """Create service account"""
+    def _run_quiet(
+        self, cmd: List[str], timeout: int = GCLOUD_OPERATION_TIMEOUT
+    ) -> Tuple[int, bytes]:
+        """Run a command whose stdout is not needed, returning (returncode, stderr)"""
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            **GCLOUD_SPAWN_OPTIONS,
+            timeout=timeout,
+        )
+        return result.returncode, result.stderr
+    
+    def _create_service_account(self, email: str, project_id: str,
+                                session: Optional['AuthorizedSession']) -> bool:
+        """Create service account, treating one that already exists as success"""
+        name = email.split('@')[0]
+        if session is not None:
+            try:
+                response = session.post(
+                    f'https://iam.googleapis.com/v1/projects/{project_id}'
+                    '/serviceAccounts',
+                    json={
+                        'accountId': name,
+                        'serviceAccount': {
+                            'displayName': 'CI/CD Service Account',
+                            'description': (
+                                'Service account for CI/CD pipeline automation'
+                            ),
+                        },
+                    },
+                    timeout=30,
+                )
+                if response.ok or response.status_code == 409:  # 409: already exists
+                    return True
+                # ADC may not be the gcloud login's identity, so let gcloud try too
+                print(
+                    f"⚠️ IAM API returned {response.status_code}, "
+                    "falling back to gcloud"
+                )
+            except Exception as e:
+                print(f"⚠️ IAM API call failed, falling back to gcloud: {e}")
+        
         try:
-            name = email.split('@')[0]
-            subprocess.run([
-                'gcloud', 'iam', 'service-accounts', 'create', name,
+            returncode, stderr = self._run_quiet([
+                GCLOUD, 'iam', 'service-accounts', 'create', name,
                 '--display-name', 'CI/CD Service Account',
                 '--description', 'Service account for CI/CD pipeline automation'
-            ], capture_output=True, text=True, check=True)
-            return True
-        except subprocess.CalledProcessError as e:
-            if "already exists" in e.stderr or "conflict" in e.stderr:
-                return True  # Already exists
+            ])
+        except:
             return False
+        if returncode == 0:
+            return True
+        error = stderr.decode('utf-8', 'replace')
+        return (
+            "already exists" in error
+            or "ALREADY_EXISTS" in error
+            or "conflict" in error
+        )
     
-    def _check_api_enabled(self, api: str) -> bool:
-        """Check if specific API is enabled"""
+    def _list_enabled_apis(self) -> Set[str]:
+        """List the APIs already enabled on the project"""
         try:
-            result = subprocess.run(['gcloud', 'services', 'list', '--enabled', '--filter', f'name={api}'], 
-                                  capture_output=True, text=True, check=True)
-            return api in result.stdout
+            result = subprocess.run(
+                [
+                    GCLOUD,
+                    'services',
+                    'list',
+                    '--enabled',
+                    '--format',
+                    'value(config.name)',
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_TIMEOUT,
+            )
+            return set(result.stdout.split())
         except:
-            return False
+            return set()
     
-    def _enable_api(self, api: str) -> bool:
-        """Enable specific API"""
+    def _enable_apis(self, apis: List[str], project_id: str,
+                     session: Optional['AuthorizedSession']) -> bool:
+        """Enable several APIs in a single batched operation"""
+        if session is not None:
+            try:
+                if self._batch_enable_apis_rest(session, apis, project_id):
+                    return True
+                print(
+                    "⚠️ Service Usage API could not enable the batch, "
+                    "falling back to gcloud"
+                )
+            except Exception as e:
+                print(f"⚠️ Service Usage API call failed, falling back to gcloud: {e}")
+        
         try:
-            subprocess.run(['gcloud', 'services', 'enable', api], 
-                         capture_output=True, text=True, check=True)
-            return True
+            returncode, _ = self._run_quiet([GCLOUD, 'services', 'enable', *apis])
+            return returncode == 0
         except:
             return False
     
-    def _create_wif_pool(self, pool_name: str) -> bool:
+    def _enable_api(
+        self, api: str, project_id: str, session: Optional['AuthorizedSession']
+    ) -> bool:
+        """Enable specific API"""
+        return self._enable_apis([api], project_id, session)
+    
+    def _batch_enable_apis_rest(
+        self, session: 'AuthorizedSession', apis: List[str], project_id: str
+    ) -> bool:
+        """One Service Usage batchEnable RPC, then wait for its long-running operation
+        """
+        response = session.post(
+            f'https://serviceusage.googleapis.com/v1/projects/{project_id}'
+            '/services:batchEnable',
+            json={'serviceIds': apis},
+            timeout=30,
+        )
+        if not response.ok:
+            return False
+        
+        return self._wait_for_operation(
+            session, 'https://serviceusage.googleapis.com/v1', response.json()
+        )
+    
+    def _wait_for_operation(
+        self, session: 'AuthorizedSession', api_root: str, operation: Dict[str, Any]
+    ) -> bool:
+        """Poll a long-running operation; True when it succeeded in time"""
+        deadline = time.time() + GCLOUD_OPERATION_TIMEOUT
+        while not operation.get('done') and time.time() < deadline:
+            time.sleep(2)
+            response = session.get(f"{api_root}/{operation['name']}", timeout=10)
+            if not response.ok:
+                return False
+            operation = response.json()
+        return bool(operation.get('done')) and 'error' not in operation
+    
+    def _create_rest(
+        self,
+        session: 'AuthorizedSession',
+        api_root: str,
+        path: str,
+        body: Dict[str, Any],
+    ) -> Optional[bool]:
+        """POST a create and wait; None when the API refused, so gcloud can try"""
+        try:
+            response = session.post(f'{api_root}/{path}', json=body, timeout=30)
+            if response.status_code == 409:  # Already exists
+                return True
+            if response.ok:
+                return self._wait_for_operation(session, api_root, response.json())
+            # ADC may not be the gcloud login's identity, so let gcloud try too
+            print(
+                f"⚠️ {api_root} returned {response.status_code}, falling back to gcloud"
+            )
+        except Exception as e:
+            print(f"⚠️ {api_root} call failed, falling back to gcloud: {e}")
+        return None
+    
+    def _create_wif_pool(self, pool_name: str, project_id: str,
+                         session: Optional['AuthorizedSession']) -> bool:
         """Create WIF pool"""
+        if session is not None:
+            created = self._create_rest(
+                session,
+                'https://iam.googleapis.com/v1',
+                f'projects/{project_id}/locations/global/workloadIdentityPools'
+                f'?workloadIdentityPoolId={pool_name}',
+                {
+                    'displayName': 'NeuroGent GitHub Actions Pool',
+                    'description': 'Workload Identity Pool for NeuroGent CI/CD',
+                },
+            )
+            if created is not None:
+                return created
+        
         try:
-            subprocess.run([
-                'gcloud', 'iam', 'workload-identity-pools', 'create', pool_name,
+            returncode, _ = self._run_quiet([
+                GCLOUD, 'iam', 'workload-identity-pools', 'create', pool_name,
                 '--location', 'global',
                 '--display-name', 'NeuroGent GitHub Actions Pool',
                 '--description', 'Workload Identity Pool for NeuroGent CI/CD'
-            ], capture_output=True, text=True, check=True)
-            return True
+            ])
+            return returncode == 0
         except:
             return False
     
-    def _create_wif_provider(self, pool_name: str, provider_name: str) -> bool:
+    def _create_wif_provider(self, pool_name: str, provider_name: str, project_id: str,
+                             session: Optional['AuthorizedSession']) -> bool:
         """Create WIF provider"""
+        if session is not None:
+            created = self._create_rest(
+                session,
+                'https://iam.googleapis.com/v1',
+                f'projects/{project_id}/locations/global'
+                f'/workloadIdentityPools/{pool_name}'
+                f'/providers?workloadIdentityPoolProviderId={provider_name}',
+                {
+                    'oidc': {
+                        'issuerUri': 'https://token.actions.githubusercontent.com'
+                    },
+                    'attributeMapping': {
+                        'google.subject': 'assertion.sub',
+                        'attribute.actor': 'assertion.actor',
+                        'attribute.repository': 'assertion.repository',
+                    },
+                    'attributeCondition': (
+                        'assertion.repository=="PramodChandrayan/neurochatagent"'
+                    ),
+                },
+            )
+            if created is not None:
+                return created
+        
         try:
-            subprocess.run([
-                'gcloud', 'iam', 'workload-identity-pools', 'providers', 'create-oidc', provider_name,
-                '--workload-identity-pool', pool_name,
-                '--location', 'global',
-                '--issuer-uri', 'https://token.actions.githubusercontent.com',
-                '--attribute-mapping', 'google.subject=assertion.sub,attribute.actor=assertion.actor,attribute.repository=assertion.repository',
-                '--attribute-condition', 'assertion.repository=="PramodChandrayan/neurochatagent"'
-            ], capture_output=True, text=True, check=True)
-            return True
+            returncode, _ = self._run_quiet(
+                [
+                    GCLOUD,
+                    'iam',
+                    'workload-identity-pools',
+                    'providers',
+                    'create-oidc',
+                    provider_name,
+                    '--workload-identity-pool',
+                    pool_name,
+                    '--location',
+                    'global',
+                    '--issuer-uri',
+                    'https://token.actions.githubusercontent.com',
+                    '--attribute-mapping',
+                    'google.subject=assertion.sub,attribute.actor=assertion.actor,'
+                    'attribute.repository=assertion.repository',
+                    '--attribute-condition',
+                    'assertion.repository=="PramodChandrayan/neurochatagent"',
+                ]
+            )
+            return returncode == 0
         except:
             return False
     
-    def _add_iam_role(self, role: str) -> bool:
-        """Add IAM role to service account"""
+    def _add_iam_roles(
+        self,
+        roles: List[str],
+        project_id: str,
+        service_account_email: str,
+        session: Optional['AuthorizedSession'],
+    ) -> bool:
+        """Add IAM roles to service account"""
+        member = f'serviceAccount:{service_account_email}'
+        if session is not None:
+            try:
+                url = (
+                    'https://cloudresourcemanager.googleapis.com/v1/projects/'
+                    f'{project_id}'
+                )
+                get_policy = {'json': {'options': {'requestedPolicyVersion': 3}}}
+                if self._add_iam_roles_rest(session, url, roles, member, get_policy):
+                    return True
+                print(
+                    "⚠️ Resource Manager API could not update the policy, "
+                    "falling back to gcloud"
+                )
+            except Exception as e:
+                print(
+                    f"⚠️ Resource Manager API call failed, falling back to gcloud: {e}"
+                )
+        
         try:
-            subprocess.run([
-                'gcloud', 'projects', 'add-iam-policy-binding', self.project_id,
-                '--member', f'serviceAccount:{self.service_account_email}',
-                '--role', role
-            ], capture_output=True, text=True, check=True)
-            return True
-        except:
-            return False
+            error = add_project_iam_bindings(project_id, member, roles)
+        except Exception as e:
+            error = str(e)
+        if error:
+            print(f"⚠️ {error}")
+        return error is None
     
-    def _configure_workload_identity_binding(self) -> bool:
+    def _add_iam_roles_rest(
+        self,
+        session: 'AuthorizedSession',
+        url: str,
+        roles: List[str],
+        member: str,
+        get_policy: Dict[str, Any],
+    ) -> bool:
+        """Read a policy, add the bindings locally, then one etag-guarded setIamPolicy.
+        
+        get_policy holds the request arguments for getIamPolicy, whose options are a
+        JSON body on Resource Manager but query parameters on the IAM service-account
+        API.
+        """
+        for _ in range(IAM_POLICY_ATTEMPTS):
+            response = session.post(f'{url}:getIamPolicy', **get_policy, timeout=30)
+            if not response.ok:
+                return False
+            
+            policy = response.json()
+            if not add_policy_bindings(policy, member, roles):
+                return True
+            
+            response = session.post(
+                f'{url}:setIamPolicy', json={'policy': policy}, timeout=30
+            )
+            if response.ok:
+                return True
+            # 409: the policy changed since it was read; re-read and try again
+            if response.status_code != 409:
+                return False
+        return False
+    
+    def _configure_workload_identity_binding(
+        self, session: Optional['AuthorizedSession']
+    ) -> bool:
         """Configure workload identity binding"""
+        member = (
+            f'principalSet://iam.googleapis.com/projects/{self.project_id}'
+            f'/locations/global/workloadIdentityPools/{self.workload_identity_pool}'
+            '/attribute.repository/PramodChandrayan/neurochatagent'
+        )
+        if session is not None:
+            try:
+                url = (
+                    f'https://iam.googleapis.com/v1/projects/{self.project_id}'
+                    f'/serviceAccounts/{self.service_account_email}'
+                )
+                get_policy = {'params': {'options.requestedPolicyVersion': 3}}
+                if self._add_iam_roles_rest(
+                    session, url, ['roles/iam.workloadIdentityUser'], member, get_policy
+                ):
+                    return True
+                print(
+                    "⚠️ IAM API could not update the service account policy, "
+                    "falling back to gcloud"
+                )
+            except Exception as e:
+                print(f"⚠️ IAM API call failed, falling back to gcloud: {e}")
+        
         try:
-            subprocess.run([
-                'gcloud', 'iam', 'service-accounts', 'add-iam-policy-binding', self.service_account_email,
-                '--role', 'roles/iam.workloadIdentityUser',
-                '--member', f'principalSet://iam.googleapis.com/projects/{self.project_id}/locations/global/workloadIdentityPools/{self.workload_identity_pool}/attribute.repository/PramodChandrayan/neurochatagent'
-            ], capture_output=True, text=True, check=True)
-            return True
+            returncode, _ = self._run_quiet(
+                [
+                    GCLOUD,
+                    'iam',
+                    'service-accounts',
+                    'add-iam-policy-binding',
+                    self.service_account_email,
+                    '--role',
+                    'roles/iam.workloadIdentityUser',
+                    '--member',
+                    member,
+                ]
+            )
+            return returncode == 0
         except:
             return False
     
     def _check_artifact_registry_exists(self, name: str, location: str) -> bool:
         """Check if Artifact Registry exists"""
         try:
-            subprocess.run([
-                'gcloud', 'artifacts', 'repositories', 'describe', name,
+            returncode, _ = self._run_quiet([
+                GCLOUD, 'artifacts', 'repositories', 'describe', name,
                 '--location', location
-            ], capture_output=True, text=True, check=True)
-            return True
+            ], GCLOUD_TIMEOUT)
+            return returncode == 0
         except:
             return False
     
-    def _create_artifact_registry(self, name: str, location: str) -> bool:
+    def _create_artifact_registry(self, name: str, location: str, project_id: str,
+                                  session: Optional['AuthorizedSession']) -> bool:
         """Create Artifact Registry"""
+        if session is not None:
+            created = self._create_rest(
+                session,
+                'https://artifactregistry.googleapis.com/v1',
+                f'projects/{project_id}/locations/{location}'
+                f'/repositories?repositoryId={name}',
+                {
+                    'format': 'DOCKER',
+                    'description': 'Docker repository for NeuroGent Finance Assistant',
+                },
+            )
+            if created is not None:
+                return created
+        
         try:
-            subprocess.run([
-                'gcloud', 'artifacts', 'repositories', 'create', name,
+            returncode, _ = self._run_quiet([
+                GCLOUD, 'artifacts', 'repositories', 'create', name,
                 '--repository-format', 'docker',
                 '--location', location,
                 '--description', 'Docker repository for NeuroGent Finance Assistant'
-            ], capture_output=True, text=True, check=True)
-            return True
+            ])
+            return returncode == 0
         except:
             return False
     
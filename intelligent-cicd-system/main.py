@@ -5,12 +5,84 @@ Main application with clean architecture and proper state management
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 from state_manager import StateManager
 from infrastructure_manager import InfrastructureManager
 from auth_manager import AuthManager
 from secrets_manager import SecretsManager
 from pipeline_generator import PipelineGenerator
 
+# Page stylesheet, built once at import with whitespace collapsed so every rerun
+# sends Streamlit a smaller element (it must still be re-emitted each run)
+_CUSTOM_CSS = ' '.join("""
+<style>
+.main-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 2rem;
+    border-radius: 15px;
+    color: white;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+
+.phase-box {
+    background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+    border-radius: 10px;
+    padding: 1.5rem;
+    margin: 1rem 0;
+    border-left: 4px solid #007bff;
+}
+
+.phase-box.complete {
+    border-left-color: #28a745;
+    background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
+}
+
+.phase-box.current {
+    border-left-color: #ffc107;
+    background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%);
+}
+
+.phase-box.pending {
+    border-left-color: #6c757d;
+    background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+}
+
+.progress-bar {
+    background: linear-gradient(90deg, #28a745 0%, #ffc107 50%, #dc3545 100%);
+    height: 20px;
+    border-radius: 10px;
+    margin: 1rem 0;
+}
+
+.status-indicator {
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    margin-right: 8px;
+}
+
+.status-success { background-color: #28a745; }
+.status-warning { background-color: #ffc107; }
+.status-error { background-color: #dc3545; }
+.status-info { background-color: #17a2b8; }
+</style>
+""".split())
+
+# Static markup; st.html skips the markdown parser on every rerun
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🚀 Intelligent CI/CD System</h1>
+    <p>Automated Cloud Run Deployment for NeuroGent Finance Assistant</p>
+</div>
+"""
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_auth_status(_auth_manager: AuthManager):
+    """CLI auth status, re-probed at most every 5 minutes or after clear()"""
+    return _auth_manager.get_current_auth_status()
+
 class IntelligentCICDSystem:
     """Main CI/CD system with clean architecture"""
     
@@ -38,16 +110,14 @@ class IntelligentCICDSystem:
             initial_sidebar_state="expanded"
         )
         
+        # The system is shared across sessions, so seed this session's state
+        self.state_manager.initialize_session_state()
+        
         # Setup custom CSS
         self._setup_custom_css()
         
         # Main header
-        st.markdown("""
-        <div class="main-header">
-            <h1>🚀 Intelligent CI/CD System</h1>
-            <p>Automated Cloud Run Deployment for NeuroGent Finance Assistant</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(_HEADER_HTML)
         
         # Show overall progress
         self._show_overall_progress()
@@ -76,61 +146,8 @@ class IntelligentCICDSystem:
     
     def _setup_custom_css(self):
         """Setup custom CSS styling"""
-        st.markdown("""
-        <style>
-        .main-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 2rem;
-            border-radius: 15px;
-            color: white;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        
-        .phase-box {
-            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-            border-radius: 10px;
-            padding: 1.5rem;
-            margin: 1rem 0;
-            border-left: 4px solid #007bff;
-        }
-        
-        .phase-box.complete {
-            border-left-color: #28a745;
-            background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-        }
-        
-        .phase-box.current {
-            border-left-color: #ffc107;
-            background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%);
-        }
-        
-        .phase-box.pending {
-            border-left-color: #6c757d;
-            background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-        }
-        
-        .progress-bar {
-            background: linear-gradient(90deg, #28a745 0%, #ffc107 50%, #dc3545 100%);
-            height: 20px;
-            border-radius: 10px;
-            margin: 1rem 0;
-        }
-        
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }
-        
-        .status-success { background-color: #28a745; }
-        .status-warning { background-color: #ffc107; }
-        .status-error { background-color: #dc3545; }
-        .status-info { background-color: #17a2b8; }
-        </style>
-        """, unsafe_allow_html=True)
+        # Re-emitted every run: Streamlit drops elements a rerun does not write again
+        st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
     
     def _show_overall_progress(self):
         """Show overall progress across all phases"""
@@ -220,7 +237,7 @@ class IntelligentCICDSystem:
         
         # Check current authentication status FIRST (before showing any UI)
         with st.spinner("🔍 Checking current authentication status..."):
-            current_auth = self.auth_manager.get_current_auth_status()
+            current_auth = _cached_auth_status(self.auth_manager)
             
             # Update state with current status
             if current_auth['gcp_authenticated']:
@@ -237,6 +254,9 @@ class IntelligentCICDSystem:
         
         # Now get the updated state
         auth_state = self.state_manager.get_auth_state()
+        fully_authenticated = (
+            auth_state['gcp_authenticated'] and auth_state['github_authenticated']
+        )
         
         # Show current authentication summary FIRST
         st.markdown("**📊 Current Authentication Status:**")
@@ -257,7 +277,7 @@ class IntelligentCICDSystem:
                 st.error("🐙 GitHub: ❌ Not Authenticated")
         
         # Only show authentication forms if NOT authenticated
-        if not auth_state['gcp_authenticated'] or not auth_state['github_authenticated']:
+        if not fully_authenticated:
             st.markdown("---")
             st.markdown("**🔐 Authentication Required:**")
             
@@ -268,6 +288,7 @@ class IntelligentCICDSystem:
                     if st.button("🔐 Authenticate GCP"):
                         with st.spinner("Authenticating with GCP..."):
                             if self.auth_manager.authenticate_gcp():
+                                _cached_auth_status.clear()
                                 st.success("✅ GCP Authentication successful!")
                                 st.rerun()
                             else:
@@ -280,6 +301,7 @@ class IntelligentCICDSystem:
                     if st.button("🔐 Authenticate GitHub"):
                         with st.spinner("Authenticating with GitHub..."):
                             if self.auth_manager.authenticate_github():
+                                _cached_auth_status.clear()
                                 st.success("✅ GitHub Authentication successful!")
                                 st.rerun()
                             else:
@@ -293,7 +315,8 @@ class IntelligentCICDSystem:
         st.markdown("---")
         if st.button("🔄 Refresh Authentication Status"):
             with st.spinner("🔍 Refreshing authentication status..."):
-                current_auth = self.auth_manager.get_current_auth_status()
+                _cached_auth_status.clear()
+                current_auth = _cached_auth_status(self.auth_manager)
                 
                 # Update state with current status
                 if current_auth['gcp_authenticated']:
@@ -312,7 +335,7 @@ class IntelligentCICDSystem:
                 st.rerun()
         
         # Proceed to next phase (only if both are authenticated)
-        if auth_state['gcp_authenticated'] and auth_state['github_authenticated']:
+        if fully_authenticated:
             st.markdown("---")
             if st.button("🏗️ Continue to Infrastructure Setup"):
                 self.state_manager.update_infrastructure_state(current_phase='infrastructure')
@@ -409,6 +432,15 @@ class IntelligentCICDSystem:
             if st.button("🔑 Continue to Secrets Extraction"):
                 self.state_manager.update_secrets_state(current_phase='secrets')
                 st.rerun()
+            
+            # A setup from an earlier run is reused for a day; this re-checks it in GCP
+            if st.button("🔄 Re-check Infrastructure"):
+                with st.spinner("Re-checking GCP infrastructure..."):
+                    if self.infrastructure_manager.setup_infrastructure(force=True):
+                        st.success("✅ Infrastructure verified")
+                    else:
+                        st.error("❌ Infrastructure re-check failed")
+                        st.info("Check the terminal for detailed error messages")
     
     def _show_secrets_phase(self):
         """Show secrets extraction phase"""
@@ -532,6 +564,28 @@ class IntelligentCICDSystem:
             self.state_manager.initialize_session_state()
             st.rerun()
 
+@st.cache_resource
+def get_system() -> IntelligentCICDSystem:
+    """Process-wide CI/CD system, built once and reused across reruns and sessions"""
+    return IntelligentCICDSystem()
+
+def main():
+    """Run the app; append ?profile=1 to the URL to profile a single rerun"""
+    system = get_system()
+    if st.query_params.get("profile") != "1":
+        system.run()
+        return
+    
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        st.warning("Profiling needs pyinstrument: pip install pyinstrument")
+        system.run()
+        return
+    
+    with Profiler() as profiler:
+        system.run()
+    components.html(profiler.output_html(), height=600, scrolling=True)
+
 if __name__ == "__main__":
-    app = IntelligentCICDSystem()
-    app.run()
+    main()
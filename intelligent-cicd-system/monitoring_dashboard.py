@@ -6,9 +6,25 @@ Live monitoring and control of CI/CD pipelines
 
 import subprocess
 import json
+import sys
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
+from auth_manager import detect_gcp_project
+from gcloud_env import GCLOUD, GCLOUD_SPAWN_OPTIONS, GCLOUD_TIMEOUT
+from github_api import GH
+
+# GitHub timestamps end in 'Z'; fromisoformat only accepts that from 3.11 on.
+# Cached because every status refresh re-parses the same run timestamps.
+if sys.version_info >= (3, 11):
+    _parse_iso = lru_cache(maxsize=256)(datetime.fromisoformat)
+else:
+    @lru_cache(maxsize=256)
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(
+            value[:-1] + '+00:00' if value.endswith('Z') else value
+        )
 
 class MonitoringDashboard:
     """Monitors and controls CI/CD pipelines in real-time"""
@@ -52,7 +68,7 @@ class MonitoringDashboard:
         """Get recent pipeline runs"""
         try:
             result = subprocess.run([
-                'gh', 'run', 'list', '--limit', '10', '--json', 
+                GH, 'run', 'list', '--limit', '10', '--json', 
                 'number,status,conclusion,startedAt,completedAt,headSha,headBranch,workflowName'
             ], capture_output=True, text=True, check=True)
             
@@ -88,7 +104,7 @@ class MonitoringDashboard:
         try:
             # Get the most recent run
             result = subprocess.run([
-                'gh', 'run', 'list', '--limit', '1', '--json', 'number'
+                GH, 'run', 'list', '--limit', '1', '--json', 'number'
             ], capture_output=True, text=True, check=True)
             
             runs = json.loads(result.stdout)
@@ -99,7 +115,7 @@ class MonitoringDashboard:
             
             # Get logs for this run
             log_result = subprocess.run([
-                'gh', 'run', 'view', str(run_number), '--log'
+                GH, 'run', 'view', str(run_number), '--log'
             ], capture_output=True, text=True, check=True)
             
             return log_result.stdout
@@ -116,7 +132,7 @@ class MonitoringDashboard:
             
             # Trigger the workflow using GitHub CLI
             result = subprocess.run([
-                'gh', 'workflow', 'run', 'ci-cd-pipeline.yml'
+                GH, 'workflow', 'run', 'ci-cd-pipeline.yml'
             ], capture_output=True, text=True, check=True)
             
             if 'Created workflow_run' in result.stdout:
@@ -137,7 +153,7 @@ class MonitoringDashboard:
         """Get status of a specific workflow"""
         try:
             result = subprocess.run([
-                'gh', 'workflow', 'view', workflow_name, '--json', 
+                GH, 'workflow', 'view', workflow_name, '--json', 
                 'name,state,createdAt,updatedAt,path'
             ], capture_output=True, text=True, check=True)
             
@@ -162,7 +178,7 @@ class MonitoringDashboard:
         """Get detailed information about a specific run"""
         try:
             result = subprocess.run([
-                'gh', 'run', 'view', str(run_id), '--json',
+                GH, 'run', 'view', str(run_id), '--json',
                 'number,status,conclusion,startedAt,completedAt,headSha,headBranch,workflowName,url'
             ], capture_output=True, text=True, check=True)
             
@@ -194,7 +210,7 @@ class MonitoringDashboard:
             print(f"🛑 Cancelling run #{run_id}...")
             
             result = subprocess.run([
-                'gh', 'run', 'cancel', str(run_id)
+                GH, 'run', 'cancel', str(run_id)
             ], capture_output=True, text=True, check=True)
             
             if 'Cancelled' in result.stdout:
@@ -217,7 +233,7 @@ class MonitoringDashboard:
             print(f"🔄 Rerunning failed jobs from run #{run_id}...")
             
             result = subprocess.run([
-                'gh', 'run', 'rerun', str(run_id), '--failed'
+                GH, 'run', 'rerun', str(run_id), '--failed'
             ], capture_output=True, text=True, check=True)
             
             if 'Created workflow_run' in result.stdout:
@@ -237,17 +253,27 @@ class MonitoringDashboard:
     def get_deployment_status(self) -> Dict[str, any]:
         """Get deployment status for Cloud Run services"""
         try:
-            # Check if we have GCP access
-            result = subprocess.run(['gcloud', 'config', 'get-value', 'project'], 
-                                  capture_output=True, text=True, check=True)
-            
-            project_id = result.stdout.strip()
+            # Read the configured project in-process; the services call checks access
+            project_id = detect_gcp_project()
             
             # Get Cloud Run services
-            services_result = subprocess.run([
-                'gcloud', 'run', 'services', 'list', '--region', 'us-central1', 
-                '--format', 'json'
-            ], capture_output=True, text=True, check=True)
+            services_result = subprocess.run(
+                [
+                    GCLOUD,
+                    'run',
+                    'services',
+                    'list',
+                    '--region',
+                    'us-central1',
+                    '--format',
+                    'json',
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_TIMEOUT,
+            )
             
             services = json.loads(services_result.stdout)
             
@@ -280,7 +306,7 @@ class MonitoringDashboard:
         """Get recent workflow runs for status calculation"""
         try:
             result = subprocess.run([
-                'gh', 'run', 'list', '--limit', '20', '--json', 
+                GH, 'run', 'list', '--limit', '20', '--json', 
                 'status,conclusion,startedAt,completedAt'
             ], capture_output=True, text=True, check=True)
             
@@ -343,7 +369,7 @@ class MonitoringDashboard:
             last_run_time = runs[0].get('startedAt', '')
             if last_run_time:
                 try:
-                    dt = datetime.fromisoformat(last_run_time.replace('Z', '+00:00'))
+                    dt = _parse_iso(last_run_time)
                     last_run = dt.strftime('%Y-%m-%d %H:%M:%S')
                 except:
                     last_run = last_run_time
@@ -364,8 +390,8 @@ class MonitoringDashboard:
             return 'N/A'
         
         try:
-            start_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+            start_dt = _parse_iso(started_at)
+            end_dt = _parse_iso(completed_at)
             
             duration = end_dt - start_dt
             
@@ -396,7 +422,7 @@ class MonitoringDashboard:
             thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
             
             result = subprocess.run([
-                'gh', 'run', 'list', '--limit', '100', '--json', 
+                GH, 'run', 'list', '--limit', '100', '--json', 
                 'status,conclusion,startedAt,completedAt'
             ], capture_output=True, text=True, check=True)
             
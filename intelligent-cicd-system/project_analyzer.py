@@ -4,10 +4,30 @@
 Analyzes project structure and determines CI/CD requirements
 """
 
+import json
 import os
 import re
 from pathlib import Path
 from typing import Dict, List, Set
+import result_cache
+
+# Bump when the analysis output changes so stale on-disk results are ignored
+ANALYSIS_VERSION = 1
+
+# Seconds a persisted analysis is kept even when nothing it is keyed on changed
+ANALYSIS_CACHE_TTL = 24 * 60 * 60
+
+# Files whose changes invalidate a persisted analysis
+_KEY_FILES = (
+    'Dockerfile', 'package.json', 'requirements.txt', 'pyproject.toml',
+    'pom.xml', 'go.mod', 'docker-compose.yml', '.env'
+)
+
+# Directories never descended into by the file scan
+_IGNORED_DIRS = frozenset({
+    '.git', '__pycache__', '.pytest_cache', 'htmlcov', '.tox',
+    'node_modules', 'dist', 'build', '.venv', 'venv'
+})
 
 class ProjectAnalyzer:
     """Analyzes project to determine CI/CD requirements and dependencies"""
@@ -21,6 +41,13 @@ class ProjectAnalyzer:
         if self.analysis_cache:
             return self.analysis_cache
         
+        # Read through the on-disk cache so a restart does not redo the file walk
+        cache_key = self._analysis_cache_key()
+        saved = result_cache.load(cache_key)
+        if saved:
+            self.analysis_cache = saved
+            return saved
+        
         analysis = {
             'project_type': self._detect_project_type(),
             'files': self._analyze_project_files(),
@@ -35,9 +62,31 @@ class ProjectAnalyzer:
         
         # Cache the analysis
         self.analysis_cache = analysis
+        result_cache.store(cache_key, analysis, expire=ANALYSIS_CACHE_TTL)
         
         return analysis
     
+    def _analysis_cache_key(self) -> str:
+        """Key on the root, analyzer version and key file, .env and root mtimes"""
+        mtimes = {}
+        env_files = [path.name for path in self.project_root.glob('.env*')]
+        for name in (*_KEY_FILES, *env_files):
+            try:
+                mtimes[name] = (self.project_root / name).stat().st_mtime_ns
+            except OSError:
+                mtimes[name] = None
+        
+        # The root's mtime changes whenever a top-level entry is added, removed or
+        # renamed. Deeper changes are left to ANALYSIS_CACHE_TTL, so a cache hit never
+        # has to walk the tree it is meant to save walking
+        try:
+            mtimes['.'] = self.project_root.stat().st_mtime_ns
+        except OSError:
+            mtimes['.'] = None
+        return result_cache.make_key(
+            'analysis', str(self.project_root), ANALYSIS_VERSION, mtimes
+        )
+    
     def _detect_project_type(self) -> str:
         """Detect the type of project"""
         if (self.project_root / 'Dockerfile').exists():
@@ -76,42 +125,49 @@ class ProjectAnalyzer:
         deployment_patterns = ['Dockerfile', 'docker-compose.yml', '*.sh', '*.bat']
         doc_patterns = ['*.md', '*.txt', '*.rst', '*.adoc']
         
-        # Analyze files
-        for file_path in self.project_root.rglob('*'):
-            if file_path.is_file() and not self._is_ignored_file(file_path):
-                relative_path = file_path.relative_to(self.project_root)
-                
-                # Source files
-                project_type = self._detect_project_type()
-                if project_type in source_patterns:
-                    for pattern in source_patterns[project_type]:
+        project_type = self._detect_project_type()
+        
+        # os.walk lists each directory once through scandir and lets ignored directories
+        # be pruned before descending, rather than rglob walking all of .git or
+        # node_modules and then stat()ing every entry again for is_file()
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d not in _IGNORED_DIRS]
+            
+            for filename in filenames:
+                file_path = Path(dirpath, filename)
+                if not self._is_ignored_file(file_path):
+                    relative_path = file_path.relative_to(self.project_root)
+                    
+                    # Source files
+                    if project_type in source_patterns:
+                        for pattern in source_patterns[project_type]:
+                            if relative_path.match(pattern):
+                                files['source_files'].append(str(relative_path))
+                                break
+                    
+                    # Config files
+                    for pattern in config_patterns:
+                        if relative_path.match(pattern):
+                            files['config_files'].append(str(relative_path))
+                            break
+                    
+                    # Dependency files
+                    for pattern in dependency_patterns:
+                        if relative_path.match(pattern):
+                            files['dependency_files'].append(str(relative_path))
+                            break
+                    
+                    # Deployment files
+                    for pattern in deployment_patterns:
+                        if relative_path.match(pattern):
+                            files['deployment_files'].append(str(relative_path))
+                            break
+                    
+                    # Documentation
+                    for pattern in doc_patterns:
                         if relative_path.match(pattern):
-                            files['source_files'].append(str(relative_path))
+                            files['documentation'].append(str(relative_path))
                             break
-                
-                # Config files
-                for pattern in config_patterns:
-                    if relative_path.match(pattern):
-                        files['config_files'].append(str(relative_path))
-                        break
-                
-                # Dependency files
-                for pattern in dependency_patterns:
-                    if relative_path.match(pattern):
-                        files['dependency_files'].append(str(relative_path))
-                        break
-                
-                # Deployment files
-                for pattern in deployment_patterns:
-                    if relative_path.match(pattern):
-                        files['deployment_files'].append(str(relative_path))
-                        break
-                
-                # Documentation
-                for pattern in doc_patterns:
-                    if relative_path.match(pattern):
-                        files['documentation'].append(str(relative_path))
-                        break
         
         return files
     
@@ -125,20 +181,20 @@ class ProjectAnalyzer:
         }
         
         # Python dependencies
-        requirements_file = self.project_root / 'requirements.txt'
-        if requirements_file.exists():
-            with open(requirements_file, 'r') as f:
+        try:
+            with open(self.project_root / 'requirements.txt', 'r') as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith('#'):
                         package = line.split('==')[0].split('>=')[0].split('<=')[0].split('~=')[0]
                         dependencies['python_packages'].append(package)
+        except FileNotFoundError:
+            pass
         
         # Node.js dependencies
         package_json = self.project_root / 'package.json'
         if package_json.exists():
             try:
-                import json
                 with open(package_json, 'r') as f:
                     data = json.load(f)
                     if 'dependencies' in data:
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+💾 Result Cache
+On-disk cache so computed results survive app restarts
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+try:
+    import diskcache
+except ImportError:  # diskcache is optional; without it nothing is persisted
+    diskcache = None
+
+CACHE_DIR = os.path.expanduser(
+    os.environ.get('CICD_CACHE_DIR', '~/.cicd_toolbox_cache')
+)
+CACHE_SIZE_LIMIT = 2**30
+
+_cache = None
+
+
+def _get_cache():
+    """Open the cache directory on first use"""
+    global _cache
+    if _cache is None and diskcache is not None:
+        _cache = diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT)
+    return _cache
+
+
+def make_key(*parts: Any) -> str:
+    """Stable key for a set of JSON-serialisable inputs"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load(key: str) -> Optional[Any]:
+    """Read a persisted result, or None when missing or unavailable"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+
+    try:
+        return cache.get(key)
+    except Exception as e:
+        print(f"⚠️ Could not read cached result: {e}")
+        return None
+
+
+def store(key: str, value: Any, expire: Optional[float] = None):
+    """Persist a result for expire seconds (or forever); failures are not raised"""
+    cache = _get_cache()
+    if cache is None:
+        return
+
+    try:
+        cache.set(key, value, expire=expire)
+    except Exception as e:
+        print(f"⚠️ Could not persist result: {e}")
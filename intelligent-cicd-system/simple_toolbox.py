@@ -1,9 +1,33 @@
 import streamlit as st
+import asyncio
 import subprocess
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from gcloud_env import (
+    GCLOUD,
+    GCLOUD_MAX_CONCURRENCY,
+    GCLOUD_OPERATION_TIMEOUT,
+    GCLOUD_SPAWN_OPTIONS,
+    GCLOUD_TIMEOUT,
+    add_project_iam_bindings,
+)
+from github_api import (
+    GH,
+    GIT_ENV,
+    GIT_PUSH_TIMEOUT,
+    SECRETS_AVAILABLE,
+    GitHubAPI,
+    get_github_token,
+)
+
+try:
+    import pygit2
+except ImportError:  # pygit2 is optional; pushes fall back to the git CLI
+    pygit2 = None
 
 # Set page config at the very top
 st.set_page_config(
@@ -13,6 +37,139 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Shared pool for overlapping independent CLI probes
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='auth-probe')
+
+def _probe_gcp() -> Dict[str, Any]:
+    """Active gcloud account and project from a single gcloud info spawn"""
+    # Asked of gcloud even when GOOGLE_APPLICATION_CREDENTIALS is set: every later step
+    # runs gcloud, which does not authenticate with that file
+    try:
+        result = subprocess.run(
+            [GCLOUD, 'info', '--format=json'],
+            capture_output=True,
+            text=True,
+            check=True,
+            **GCLOUD_SPAWN_OPTIONS,
+            timeout=GCLOUD_TIMEOUT,
+        )
+        gcloud_config = json.loads(result.stdout).get('config', {})
+        return {'gcp_account': gcloud_config.get('account') or None,
+                'gcp_project': gcloud_config.get('project') or None, 'gcp_error': None}
+    except Exception as e:
+        return {'gcp_account': None, 'gcp_project': None, 'gcp_error': str(e)}
+
+def _probe_gh() -> Dict[str, Any]:
+    """GitHub login state and user from the authenticated user's login"""
+    status = {'github_authenticated': False, 'github_user': None, 'github_error': None}
+    # gh authenticates with an environment token, so trust it without a call
+    if os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN'):
+        status['github_authenticated'] = True
+        status['github_user'] = os.environ.get('GITHUB_ACTOR') or 'Unknown'
+        return status
+    try:
+        result = subprocess.run(
+            [GH, 'api', 'user', '--jq', '.login'],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=GCLOUD_TIMEOUT,
+        )
+        login = result.stdout.strip()
+        if result.returncode == 0 and login:
+            status['github_authenticated'] = True
+            status['github_user'] = login
+    except Exception as e:
+        status['github_error'] = str(e)
+    return status
+
+
+async def _run_gcloud_async(
+    command: List[str], slots: asyncio.Semaphore
+) -> subprocess.CompletedProcess:
+    """Run a gcloud command off the event loop, holding one of the fan-out's slots"""
+    async with slots:
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **GCLOUD_SPAWN_OPTIONS,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(), timeout=GCLOUD_OPERATION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(command, GCLOUD_OPERATION_TIMEOUT)
+        finally:
+            # On timeout or cancellation, kill and reap gcloud so it never outlives us
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass  # Exited between the check and the kill
+                await proc.wait()
+    return subprocess.CompletedProcess(
+        command, proc.returncode, stdout.decode(), stderr.decode()
+    )
+
+
+def _run_gcloud_parallel(
+    commands: Dict[str, List[str]], limit: int
+) -> Dict[str, subprocess.CompletedProcess]:
+    """Run independent gcloud commands, at most `limit` at once, keyed like the input"""
+    async def run_all() -> List[subprocess.CompletedProcess]:
+        # Created inside the loop: a semaphore binds to the loop that first uses it
+        slots = asyncio.Semaphore(limit)
+        return await asyncio.gather(
+            *(_run_gcloud_async(command, slots) for command in commands.values())
+        )
+    
+    return dict(zip(commands, asyncio.run(run_all())))
+
+
+def _already_exists(result: subprocess.CompletedProcess) -> bool:
+    """Whether a failed create only failed because the resource is already there"""
+    return "already exists" in result.stderr.lower()
+
+_github_api = None
+
+def _get_github_api() -> Optional[GitHubAPI]:
+    """Keep-alive GitHub REST client, created once the gh token is available"""
+    global _github_api
+    if _github_api is None and SECRETS_AVAILABLE:
+        token = get_github_token()
+        if token:
+            _github_api = GitHubAPI(token)
+    return _github_api
+
+# Single worker: one push at a time
+_PUSH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='git-push')
+
+@st.fragment(run_every=2)
+def _push_progress(toolbox: 'SimpleToolbox'):
+    """Poll the background push every 2s without rerunning the whole page"""
+    future = st.session_state.get('_push_future')
+    if future is None:
+        return
+    if not future.done():
+        st.info("📤 Pushing code to GitHub...")
+        return
+    
+    del st.session_state['_push_future']
+    ok, message = future.result()
+    st.session_state['_push_result'] = (ok, message)
+    if ok:
+        toolbox.update_state(secrets_complete=True, pipeline_complete=True)
+    st.rerun()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _probe_auth() -> Dict[str, Any]:
+    """Run the gcloud and gh status checks concurrently, reused across reruns for 60s"""
+    gcp = _PROBE_EXECUTOR.submit(_probe_gcp)
+    gh = _PROBE_EXECUTOR.submit(_probe_gh)
+    return {**gcp.result(), **gh.result()}
+
 class SimpleToolbox:
     def __init__(self):
         self.initialize_state()
@@ -20,20 +177,14 @@ class SimpleToolbox:
     
     def initialize_state(self):
         """Initialize default state values"""
-        if 'phase' not in st.session_state:
-            st.session_state['phase'] = 'authentication'
-        if 'gcp_authenticated' not in st.session_state:
-            st.session_state['gcp_authenticated'] = False
-        if 'github_authenticated' not in st.session_state:
-            st.session_state['github_authenticated'] = False
-        if 'infrastructure_complete' not in st.session_state:
-            st.session_state['infrastructure_complete'] = False
-        if 'secrets_complete' not in st.session_state:
-            st.session_state['secrets_complete'] = False
-        if 'pipeline_complete' not in st.session_state:
-            st.session_state['pipeline_complete'] = False
-        if 'cicd_files_created' not in st.session_state:
-            st.session_state['cicd_files_created'] = False
+        st.session_state.setdefault('phase', 'authentication')
+        st.session_state.setdefault('gcp_authenticated', False)
+        st.session_state.setdefault('github_authenticated', False)
+        st.session_state.setdefault('infrastructure_complete', False)
+        st.session_state.setdefault('secrets_complete', False)
+        st.session_state.setdefault('pipeline_complete', False)
+        st.session_state.setdefault('cicd_files_created', False)
+        st.session_state.setdefault('gcp_concurrency', GCLOUD_MAX_CONCURRENCY)
     
     def load_state(self):
         """Load state from file"""
@@ -52,13 +203,18 @@ class SimpleToolbox:
             # Filter out non-serializable objects
             state_data = {}
             for key, value in st.session_state.items():
+                if key.startswith('_'):
+                    continue  # Runtime-only entries such as the pending push
                 if isinstance(value, (str, int, float, bool, list, dict)):
                     state_data[key] = value
                 else:
                     state_data[key] = str(value)
             
+            # Serialize first and write once: no per-token writes, and a value that
+            # fails to encode can no longer leave a truncated state file behind
+            payload = json.dumps(state_data, indent=2)
             with open('toolbox_state.json', 'w') as f:
-                json.dump(state_data, f, indent=2)
+                f.write(payload)
         except Exception as e:
             st.error(f"Could not save state: {e}")
     
@@ -70,9 +226,7 @@ class SimpleToolbox:
     
     def add_error(self, message: str):
         """Add error message to session state"""
-        if 'errors' not in st.session_state:
-            st.session_state['errors'] = []
-        st.session_state['errors'].append(message)
+        st.session_state.setdefault('errors', []).append(message)
     
     def run(self):
         """Main application runner"""
@@ -82,6 +236,10 @@ class SimpleToolbox:
         # Show current phase
         st.sidebar.markdown("## 📍 Current Phase")
         st.sidebar.info(f"**{st.session_state['phase'].title()}**")
+        # Larger GCP quotas allow a wider fan-out; setup reads this on the script thread
+        st.sidebar.number_input(
+            "GCP concurrency", min_value=1, max_value=16, key='gcp_concurrency'
+        )
         
         # Phase navigation
         if st.session_state['phase'] == 'authentication':
@@ -109,6 +267,7 @@ class SimpleToolbox:
             if st.button("🔑 Authenticate GCP"):
                 if self.authenticate_gcp():
                     st.success("✅ GCP authentication successful!")
+                    _probe_auth.clear()
                     self.update_state(phase='infrastructure')
                     st.rerun()
                 else:
@@ -118,6 +277,7 @@ class SimpleToolbox:
             if st.button("🔑 Authenticate GitHub"):
                 if self.authenticate_github():
                     st.success("✅ GitHub authentication successful!")
+                    _probe_auth.clear()
                     st.rerun()
                 else:
                     st.error("❌ GitHub authentication failed")
@@ -132,42 +292,29 @@ class SimpleToolbox:
         """Check current authentication status"""
         st.markdown("### 🔍 Authentication Status")
         
+        if st.button("🔄 Re-check Authentication"):
+            _probe_auth.clear()
+        status = _probe_auth()
+        
         # GCP Status
-        try:
-            result = subprocess.run(['gcloud', 'auth', 'list', '--filter=status:ACTIVE', '--format=value(account)'], 
-                                 capture_output=True, text=True, check=True)
-            if result.stdout.strip():
-                st.success(f"✅ **GCP**: {result.stdout.strip()}")
-                st.session_state['gcp_authenticated'] = True
-            else:
-                st.error("❌ **GCP**: Not authenticated")
-                st.session_state['gcp_authenticated'] = False
-        except Exception as e:
-            st.error(f"❌ **GCP**: Error checking status - {e}")
-            st.session_state['gcp_authenticated'] = False
+        if status['gcp_error']:
+            st.error(f"❌ **GCP**: Error checking status - {status['gcp_error']}")
+        elif status['gcp_account']:
+            st.success(f"✅ **GCP**: {status['gcp_account']}")
+        else:
+            st.error("❌ **GCP**: Not authenticated")
+        st.session_state['gcp_authenticated'] = status['gcp_account'] is not None
+        if status['gcp_project']:
+            st.session_state['gcp_project'] = status['gcp_project']
         
         # GitHub Status
-        try:
-            result = subprocess.run(['gh', 'auth', 'status'], capture_output=True, text=True, check=False)
-            if result.returncode == 0 and 'Logged in to github.com' in result.stdout:
-                # Extract username
-                username_match = None
-                for line in result.stdout.split('\n'):
-                    if 'Logged in to github.com as' in line:
-                        username_match = line.split('Logged in to github.com as')[-1].strip()
-                        break
-                
-                if username_match:
-                    st.success(f"✅ **GitHub**: {username_match}")
-                else:
-                    st.success("✅ **GitHub**: Authenticated")
-                st.session_state['github_authenticated'] = True
-            else:
-                st.error("❌ **GitHub**: Not authenticated")
-                st.session_state['github_authenticated'] = False
-        except Exception as e:
-            st.error(f"❌ **GitHub**: Error checking status - {e}")
-            st.session_state['github_authenticated'] = False
+        if status['github_error']:
+            st.error(f"❌ **GitHub**: Error checking status - {status['github_error']}")
+        elif status['github_authenticated']:
+            st.success(f"✅ **GitHub**: {status['github_user'] or 'Authenticated'}")
+        else:
+            st.error("❌ **GitHub**: Not authenticated")
+        st.session_state['github_authenticated'] = status['github_authenticated']
     
     def authenticate_gcp(self) -> bool:
         """Authenticate with GCP"""
@@ -175,8 +322,20 @@ class SimpleToolbox:
             st.info("🔑 Authenticating with GCP...")
             
             # Check if already authenticated
-            result = subprocess.run(['gcloud', 'auth', 'list', '--filter=status:ACTIVE'], 
-                                 capture_output=True, text=True, check=True)
+            result = subprocess.run(
+                [
+                    GCLOUD,
+                    'auth',
+                    'list',
+                    '--filter=status:ACTIVE',
+                    '--format=value(account)',
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_TIMEOUT,
+            )
             
             if result.stdout.strip():
                 st.success("✅ Already authenticated with GCP")
@@ -184,8 +343,14 @@ class SimpleToolbox:
             
             # Run interactive authentication
             st.info("📱 Please complete GCP authentication in the terminal...")
-            result = subprocess.run(['gcloud', 'auth', 'login'], 
-                                 capture_output=True, text=True, check=True)
+            result = subprocess.run(
+                [GCLOUD, 'auth', 'login'],
+                capture_output=True,
+                text=True,
+                check=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_OPERATION_TIMEOUT,
+            )
             
             if result.returncode == 0:
                 st.success("✅ GCP authentication successful!")
@@ -204,15 +369,21 @@ class SimpleToolbox:
             st.info("🔑 Authenticating with GitHub...")
             
             # Check if already authenticated
-            result = subprocess.run(['gh', 'auth', 'status'], capture_output=True, text=True, check=False)
+            result = subprocess.run(
+                [GH, 'api', 'user', '--jq', '.login'],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=GCLOUD_TIMEOUT,
+            )
             
-            if result.returncode == 0 and 'Logged in to github.com' in result.stdout:
+            if result.returncode == 0 and result.stdout.strip():
                 st.success("✅ Already authenticated with GitHub")
                 return True
             
             # Run interactive authentication
             st.info("📱 Please complete GitHub authentication in the terminal...")
-            result = subprocess.run(['gh', 'auth', 'login'], 
+            result = subprocess.run([GH, 'auth', 'login'], 
                                  capture_output=True, text=True, check=True)
             
             if result.returncode == 0:
@@ -252,10 +423,11 @@ class SimpleToolbox:
     def setup_infrastructure(self) -> bool:
         """Setup GCP infrastructure"""
         try:
-            # Get current project
-            project_result = subprocess.run(['gcloud', 'config', 'get-value', 'project'], 
-                                         capture_output=True, text=True, check=True)
-            project_id = project_result.stdout.strip()
+            # Get current project, reusing the one read with the auth status (the
+            # cached probe already ran gcloud info, so no second spawn for it)
+            project_id = (
+                st.session_state.get('gcp_project') or _probe_auth()['gcp_project']
+            )
             
             if not project_id:
                 st.error("❌ No GCP project configured")
@@ -273,38 +445,44 @@ class SimpleToolbox:
                 'cloudbuild.googleapis.com'
             ]
             
-            for api in required_apis:
-                try:
-                    st.info(f"🔌 Enabling {api}...")
-                    subprocess.run(['gcloud', 'services', 'enable', api], 
-                                capture_output=True, text=True, check=True)
-                    st.success(f"✅ Enabled {api}")
-                except subprocess.CalledProcessError as e:
-                    if "already enabled" in e.stderr.lower():
-                        st.success(f"✅ {api} already enabled")
+            # One batched operation for every API; already-enabled ones are a no-op
+            st.info(f"🔌 Enabling {len(required_apis)} APIs...")
+            result = subprocess.run(
+                [GCLOUD, 'services', 'enable', *required_apis],
+                capture_output=True,
+                text=True,
+                **GCLOUD_SPAWN_OPTIONS,
+                timeout=GCLOUD_OPERATION_TIMEOUT,
+            )
+            # Lines are collected and rendered as one element per outcome rather than
+            # one per API, so the browser gets one delta instead of one per line
+            if result.returncode == 0:
+                st.success("  \n".join(f"✅ Enabled {api}" for api in required_apis))
+            else:
+                # The batch is all-or-nothing, so retry each API in parallel and report
+                # on this thread (Streamlit calls are not thread-safe)
+                results = _run_gcloud_parallel(
+                    {api: [GCLOUD, 'services', 'enable', api] for api in required_apis},
+                    st.session_state['gcp_concurrency'],
+                )
+                enabled, failed = [], []
+                for api in required_apis:
+                    result = results[api]
+                    if result.returncode == 0:
+                        enabled.append(f"✅ Enabled {api}")
+                    elif "already enabled" in result.stderr.lower():
+                        enabled.append(f"✅ {api} already enabled")
                     else:
-                        st.warning(f"⚠️ Could not enable {api}: {e.stderr}")
+                        failed.append(f"⚠️ Could not enable {api}: {result.stderr}")
+                if enabled:
+                    st.success("  \n".join(enabled))
+                if failed:
+                    st.warning("  \n".join(failed))
             
-            # Create service account
             service_account_name = "cicd-service-account"
             service_account_email = f"{service_account_name}@{project_id}.iam.gserviceaccount.com"
-            
-            try:
-                st.info(f"👤 Creating service account: {service_account_name}")
-                subprocess.run(['gcloud', 'iam', 'service-accounts', 'create', service_account_name, 
-                              '--display-name', 'CI/CD Service Account'], 
-                             capture_output=True, text=True, check=True)
-                st.success(f"✅ Created service account: {service_account_email}")
-            except subprocess.CalledProcessError as e:
-                if "already exists" in e.stderr.lower():
-                    st.success(f"✅ Service account already exists: {service_account_email}")
-                else:
-                    st.error(f"❌ Failed to create service account: {e.stderr}")
-                    return False
-            
-            st.session_state['service_account_email'] = service_account_email
-            
-            # Grant necessary roles
+            pool_name = "neurogent-wif-pool"
+            provider_name = "github-actions"
             roles = [
                 'roles/run.admin',
                 'roles/iam.serviceAccountUser',
@@ -312,63 +490,75 @@ class SimpleToolbox:
                 'roles/cloudbuild.builds.builder'
             ]
             
-            for role in roles:
-                try:
-                    st.info(f"🔐 Granting {role}...")
-                    subprocess.run(['gcloud', 'projects', 'add-iam-policy-binding', project_id,
-                                  '--member', f'serviceAccount:{service_account_email}',
-                                  '--role', role], 
-                                 capture_output=True, text=True, check=True)
-                    st.success(f"✅ Granted {role}")
-                except subprocess.CalledProcessError as e:
-                    st.warning(f"⚠️ Could not grant {role}: {e.stderr}")
+            # The service account (then its roles), the registry and the WIF pool
+            # (then its provider) are independent, so the three chains run together
+            st.info(
+                "🏗️ Creating service account, Artifact Registry and "
+                "Workload Identity Federation..."
+            )
+            created = asyncio.run(
+                self._create_resources(
+                    project_id,
+                    service_account_name,
+                    service_account_email,
+                    pool_name,
+                    provider_name,
+                    roles,
+                    st.session_state['gcp_concurrency'],
+                )
+            )
             
-            # Create Artifact Registry
-            try:
-                st.info("📦 Creating Artifact Registry...")
-                subprocess.run(['gcloud', 'artifacts', 'repositories', 'create', 'neurogent-repo',
-                              '--repository-format', 'docker',
-                              '--location', 'us-central1'], 
-                             capture_output=True, text=True, check=True)
+            # Report on this thread in the usual order once everything has landed
+            service_account = created['service_account']
+            if service_account.returncode == 0:
+                st.success(f"✅ Created service account: {service_account_email}")
+            elif _already_exists(service_account):
+                st.success(f"✅ Service account already exists: {service_account_email}")
+            else:
+                st.error(
+                    f"❌ Failed to create service account: {service_account.stderr}"
+                )
+                return False
+            
+            st.session_state['service_account_email'] = service_account_email
+            
+            if created['roles_error'] is None:
+                st.success("  \n".join(f"✅ Granted {role}" for role in roles))
+            else:
+                st.warning(f"⚠️ Could not grant roles: {created['roles_error']}")
+            
+            registry = created['artifact_registry']
+            if registry.returncode == 0:
                 st.success("✅ Created Artifact Registry: neurogent-repo")
-            except subprocess.CalledProcessError as e:
-                if "already exists" in e.stderr.lower():
-                    st.success("✅ Artifact Registry already exists: neurogent-repo")
-                else:
-                    st.warning(f"⚠️ Could not create Artifact Registry: {e.stderr}")
+            elif _already_exists(registry):
+                st.success("✅ Artifact Registry already exists: neurogent-repo")
+            else:
+                st.warning(f"⚠️ Could not create Artifact Registry: {registry.stderr}")
             
-            # Setup Workload Identity Federation
-            try:
-                st.info("🔗 Setting up Workload Identity Federation...")
-                
-                # Create WIF pool
-                pool_name = "neurogent-wif-pool"
-                subprocess.run(['gcloud', 'iam', 'workload-identity-pools', 'create', pool_name,
-                              '--location', 'global',
-                              '--display-name', 'Neurogent WIF Pool'], 
-                             capture_output=True, text=True, check=True)
-                st.success(f"✅ Created WIF pool: {pool_name}")
-                
-                # Create OIDC provider
-                provider_name = "github-actions"
-                subprocess.run(['gcloud', 'iam', 'workload-identity-pools', 'providers', 'create-oidc', provider_name,
-                              '--workload-identity-pool', pool_name,
-                              '--location', 'global',
-                              '--issuer-uri', 'https://token.actions.githubusercontent.com',
-                              '--attribute-mapping', 'google.subject=assertion.sub,attribute.actor=assertion.actor,attribute.repository=assertion.repository,attribute.repository_owner=assertion.repository_owner',
-                              '--attribute-condition', 'assertion.repository_owner=="PramodChandrayan"'], 
-                             capture_output=True, text=True, check=True)
-                st.success(f"✅ Created OIDC provider: {provider_name}")
-                
-                st.session_state['workload_identity_pool'] = pool_name
-                st.session_state['workload_identity_provider'] = provider_name
-                
-            except subprocess.CalledProcessError as e:
-                if "already exists" in e.stderr.lower():
-                    st.success("✅ Workload Identity Federation already exists")
-                else:
-                    st.error(f"❌ Failed to setup WIF: {e.stderr}")
-                    return False
+            # The provider is only attempted (not None) once the pool was created
+            failed = next(
+                (
+                    result
+                    for result in (created['wif_pool'], created['wif_provider'])
+                    if result.returncode != 0
+                ),
+                None,
+            )
+            if failed is None:
+                st.success(
+                    f"✅ Created WIF pool: {pool_name}  \n"
+                    f"✅ Created OIDC provider: {provider_name}"
+                )
+            elif _already_exists(failed):
+                st.success("✅ Workload Identity Federation already exists")
+            else:
+                st.error(f"❌ Failed to setup WIF: {failed.stderr}")
+                return False
+            
+            # The names are fixed, so an existing pool is recorded too and the secrets
+            # phase never has to look it up
+            st.session_state['workload_identity_pool'] = pool_name
+            st.session_state['workload_identity_provider'] = provider_name
             
             st.success("🎉 Infrastructure setup complete!")
             return True
@@ -377,6 +567,120 @@ class SimpleToolbox:
             st.error(f"❌ Infrastructure setup failed: {e}")
             return False
     
+    async def _create_resources(
+        self,
+        project_id: str,
+        service_account_name: str,
+        service_account_email: str,
+        pool_name: str,
+        provider_name: str,
+        roles: List[str],
+        limit: int,
+    ) -> Dict[str, Any]:
+        """Run the create chains concurrently, at most `limit` gcloud calls at once"""
+        slots = asyncio.Semaphore(limit)
+        
+        async def service_account_chain():
+            result = await _run_gcloud_async(
+                [
+                    GCLOUD,
+                    'iam',
+                    'service-accounts',
+                    'create',
+                    service_account_name,
+                    '--display-name',
+                    'CI/CD Service Account',
+                ],
+                slots,
+            )
+            if result.returncode != 0 and not _already_exists(result):
+                return result, None
+            # The policy helper is a blocking read-modify-write; keep it off the loop
+            async with slots:
+                error = await asyncio.to_thread(
+                    add_project_iam_bindings,
+                    project_id,
+                    f'serviceAccount:{service_account_email}',
+                    roles,
+                )
+            return result, error
+        
+        async def wif_chain():
+            pool = await _run_gcloud_async(
+                [
+                    GCLOUD,
+                    'iam',
+                    'workload-identity-pools',
+                    'create',
+                    pool_name,
+                    '--location',
+                    'global',
+                    '--display-name',
+                    'Neurogent WIF Pool',
+                ],
+                slots,
+            )
+            if pool.returncode != 0:
+                return pool, None
+            provider = await _run_gcloud_async(
+                [
+                    GCLOUD,
+                    'iam',
+                    'workload-identity-pools',
+                    'providers',
+                    'create-oidc',
+                    provider_name,
+                    '--workload-identity-pool',
+                    pool_name,
+                    '--location',
+                    'global',
+                    '--issuer-uri',
+                    'https://token.actions.githubusercontent.com',
+                    '--attribute-mapping',
+                    'google.subject=assertion.sub,attribute.actor=assertion.actor,'
+                    'attribute.repository=assertion.repository,'
+                    'attribute.repository_owner=assertion.repository_owner',
+                    '--attribute-condition',
+                    'assertion.repository_owner=="PramodChandrayan"',
+                ],
+                slots,
+            )
+            return pool, provider
+        
+        # Let every chain finish before surfacing a failure, so none is cut off midway
+        results = await asyncio.gather(
+            service_account_chain(),
+            _run_gcloud_async(
+                [
+                    GCLOUD,
+                    'artifacts',
+                    'repositories',
+                    'create',
+                    'neurogent-repo',
+                    '--repository-format',
+                    'docker',
+                    '--location',
+                    'us-central1',
+                ],
+                slots,
+            ),
+            wif_chain(),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        (service_account, roles_error), artifact_registry, (wif_pool, wif_provider) = (
+            results
+        )
+        return {
+            'service_account': service_account,
+            'roles_error': roles_error,
+            'artifact_registry': artifact_registry,
+            'wif_pool': wif_pool,
+            'wif_provider': wif_provider
+        }
+    
     def show_secrets_phase(self):
         """Show secrets configuration phase"""
         st.markdown("## 🔐 Phase 3: Secrets Configuration")
@@ -421,7 +725,7 @@ class SimpleToolbox:
             
             # Check GitHub repository
             try:
-                result = subprocess.run(['gh', 'repo', 'view', '--json', 'name,owner'], 
+                result = subprocess.run([GH, 'repo', 'view', '--json', 'name,owner'], 
                                       capture_output=True, text=True, check=True)
                 repo_info = json.loads(result.stdout)
                 repo_name = repo_info['name']
@@ -433,8 +737,12 @@ class SimpleToolbox:
             
             # Check existing secrets
             try:
-                result = subprocess.run(['gh', 'secret', 'list', '--repo', f'{repo_owner}/{repo_name}'], 
-                                      capture_output=True, text=True, check=True)
+                result = subprocess.run(
+                    [GH, 'secret', 'list', '--repo', f'{repo_owner}/{repo_name}'],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
                 existing_secrets = result.stdout
                 
                 required_secrets = {
@@ -460,17 +768,19 @@ class SimpleToolbox:
                 if st.button("🚀 Configure Missing Secrets"):
                     with st.spinner("Configuring secrets..."):
                         success_count = 0
+                        errors = self._set_secrets(
+                            f'{repo_owner}/{repo_name}',
+                            {name: required_secrets[name] for name in missing_secrets},
+                        )
                         
-                        for secret_name in missing_secrets:
-                            try:
-                                secret_value = required_secrets[secret_name]
-                                result = subprocess.run(['gh', 'secret', 'set', secret_name, '--repo', 
-                                                       f'{repo_owner}/{repo_name}', '--body', secret_value], 
-                                                      capture_output=True, text=True, check=True)
+                        for secret_name, error in errors.items():
+                            if error is None:
                                 st.success(f"✅ {secret_name} configured successfully!")
                                 success_count += 1
-                            except Exception as e:
-                                st.error(f"❌ Failed to configure {secret_name}: {e}")
+                            else:
+                                st.error(
+                                    f"❌ Failed to configure {secret_name}: {error}"
+                                )
                         
                         if success_count == len(missing_secrets):
                             st.success("🎉 All secrets configured successfully!")
@@ -489,6 +799,56 @@ class SimpleToolbox:
             st.error(f"❌ Secrets configuration failed: {e}")
             return False
     
+    def _set_secrets(
+        self, repo: str, secrets: Dict[str, str]
+    ) -> Dict[str, Optional[str]]:
+        """Store secrets over REST when possible, else concurrent gh; name -> error"""
+        api = _get_github_api()
+        if api is not None:
+            try:
+                return api.set_secrets(repo, secrets)
+            except Exception as e:
+                st.warning(
+                    f"⚠️ GitHub API unavailable ({e}), falling back to gh CLI..."
+                )
+        
+        def set_secret(secret_name: str) -> Optional[str]:
+            try:
+                result = subprocess.run(
+                    [
+                        GH,
+                        'secret',
+                        'set',
+                        secret_name,
+                        '--repo',
+                        repo,
+                        '--body',
+                        secrets[secret_name],
+                    ],
+                    capture_output=True,
+                    text=True,
+                    timeout=GCLOUD_TIMEOUT,
+                )
+            except subprocess.TimeoutExpired:
+                return f"gh secret set timed out after {GCLOUD_TIMEOUT}s"
+            return None if result.returncode == 0 else result.stderr.strip()
+        
+        # Overlap the gh start-up and API round-trips; the caller renders results
+        errors = {}
+        progress = st.progress(0.0, text="Setting secrets with gh...")
+        with ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='gh-secret'
+        ) as executor:
+            futures = {executor.submit(set_secret, name): name for name in secrets}
+            # One bar, advanced on the script thread as each call lands
+            for done, future in enumerate(as_completed(futures), 1):
+                errors[futures[future]] = future.result()
+                progress.progress(
+                    done / len(futures), text=f"Set {done}/{len(futures)} secrets"
+                )
+        progress.empty()
+        return {name: errors[name] for name in secrets}
+    
     def show_pipeline_phase(self):
         """Show pipeline creation phase"""
         st.markdown("## 📋 Phase 4: Pipeline Creation")
@@ -960,19 +1320,26 @@ CMD ["streamlit", "run", "simple_toolbox.py", "--server.port=8501", "--server.ad
             st.markdown("### 🚀 Manual Code Push")
             st.info("🔒 **User Control**: You decide when to push code and trigger the pipeline")
             
-            if st.button("🚀 Push Code & Trigger Pipeline"):
-                with st.spinner("Pushing code to GitHub..."):
-                    if self.push_code_to_github():
-                        st.success("🎉 Code pushed successfully!")
-                        st.info("🚀 CI/CD pipeline is now running!")
-                        st.info("📊 Check GitHub Actions for progress")
-                        
-                        # Update state
-                        self.update_state(secrets_complete=True, pipeline_complete=True)
-                        return True
-                    else:
-                        st.error("❌ Failed to push code")
-                        return False
+            pushing = '_push_future' in st.session_state
+            if st.button("🚀 Push Code & Trigger Pipeline", disabled=pushing):
+                # Push off the script thread so the page stays responsive
+                st.session_state['_push_future'] = _PUSH_EXECUTOR.submit(
+                    self.push_code_to_github
+                )
+                pushing = True
+            
+            if pushing:
+                _push_progress(self)
+            
+            push_result = st.session_state.get('_push_result')
+            if push_result:
+                ok, message = push_result
+                if ok:
+                    st.success(f"🎉 {message}")
+                    st.info("🚀 CI/CD pipeline is now running!")
+                    st.info("📊 Check GitHub Actions for progress")
+                else:
+                    st.error(f"❌ {message}")
             
             # Show next steps
             st.markdown("### 🎯 Next Steps:")
@@ -983,48 +1350,93 @@ CMD ["streamlit", "run", "simple_toolbox.py", "--server.port=8501", "--server.ad
             
             st.warning("⚠️ **Important**: Pipeline will NOT trigger automatically. You must manually push code when ready.")
     
-    def push_code_to_github(self) -> bool:
-        """Push code to GitHub to trigger CI/CD pipeline"""
+    def push_code_to_github(self) -> Tuple[bool, str]:
+        """Push code to GitHub to trigger CI/CD pipeline (worker thread, no st calls)"""
         try:
-            st.info("📤 Pushing code to GitHub...")
-            
-            # Check git status
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                 capture_output=True, text=True, check=True)
-            
-            if not result.stdout.strip():
-                st.info("ℹ️ No changes to commit - adding CI/CD files...")
-                # Force add CI/CD files even if no changes
-                subprocess.run(['git', 'add', '.github/', 'Dockerfile', 'requirements.txt'], check=True)
-            else:
-                st.info("📝 Adding all changes...")
-                subprocess.run(['git', 'add', '.'], check=True)
-            
-            # Commit with descriptive message
+            current_branch = self._current_branch()
             commit_msg = f"🚀 Add CI/CD pipeline and trigger deployment - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            subprocess.run(['git', 'commit', '-m', commit_msg], check=True)
-            
-            # Get current branch
-            branch_result = subprocess.run(['git', 'branch', '--show-current'], 
-                                         capture_output=True, text=True, check=True)
-            current_branch = branch_result.stdout.strip()
             
-            st.info(f"📤 Pushing to branch: {current_branch}")
+            if pygit2 is not None and current_branch != 'HEAD':
+                try:
+                    self._push_with_pygit2(current_branch, commit_msg)
+                    return True, f"Code pushed to {current_branch}"
+                except Exception:
+                    # Any libgit2 failure, or a pygit2 too old for these callbacks, falls
+                    # back to the git CLI, which also sees credential helpers
+                    pass
             
-            # Push to current branch
-            subprocess.run(['git', 'push', 'origin', current_branch], check=True)
+            # Stage, commit only if something is staged, and push in a single spawn;
+            # exec hands the push bash's pid, so the timeout kill reaches it
+            script = (
+                'git add -A && '
+                '{ git diff --cached --quiet || git commit -q -m "$COMMIT_MSG"; } && '
+                'exec git push origin "$BRANCH"'
+            )
+            result = subprocess.run(
+                ['bash', '-c', script],
+                env={**GIT_ENV, 'COMMIT_MSG': commit_msg, 'BRANCH': current_branch},
+                capture_output=True,
+                text=True,
+                timeout=GIT_PUSH_TIMEOUT,
+            )
             
-            st.success("🎉 Code pushed successfully!")
-            st.info("🚀 CI/CD pipeline is now running!")
+            if result.returncode != 0:
+                return False, f"Git operation failed: {result.stderr.strip()}"
             
-            return True
+            return True, f"Code pushed to {current_branch}"
             
-        except subprocess.CalledProcessError as e:
-            st.error(f"❌ Git operation failed: {e}")
-            return False
+        except subprocess.TimeoutExpired:
+            return False, f"Git push timed out after {GIT_PUSH_TIMEOUT}s"
         except Exception as e:
-            st.error(f"❌ Failed to push code: {e}")
-            return False
+            return False, f"Failed to push code: {e}"
+    
+    def _push_with_pygit2(self, branch: str, commit_msg: str):
+        """Stage, commit if anything changed, and push in-process through libgit2"""
+        repo = pygit2.Repository('.')
+        repo.index.add_all()
+        repo.index.write()
+        tree = repo.index.write_tree()
+        
+        if repo.head_is_unborn or tree != repo.head.peel(pygit2.Commit).tree_id:
+            signature = repo.default_signature
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            repo.create_commit('HEAD', signature, signature, commit_msg, tree, parents)
+        
+        repo.remotes['origin'].push(
+            [f'refs/heads/{branch}'], callbacks=_PushCallbacks()
+        )
+    
+    def _current_branch(self) -> str:
+        """Read the checked-out branch from .git/HEAD without spawning git"""
+        try:
+            head = Path('.git/HEAD').read_text().strip()
+        except OSError:
+            return 'HEAD'
+        prefix = 'ref: refs/heads/'
+        return head[len(prefix):] if head.startswith(prefix) else 'HEAD'
+
+if pygit2 is not None:
+    class _PushCallbacks(pygit2.RemoteCallbacks):
+        """Credentials from ssh-agent or the GitHub token, and surface rejected refs"""
+        
+        def __init__(self):
+            super().__init__()
+            self.tried_agent = False
+        
+        def credentials(self, url, username_from_url, allowed_types):
+            # libgit2 asks again after a rejected key, so offer ssh-agent only once
+            ssh_key = allowed_types & pygit2.enums.CredentialType.SSH_KEY
+            if ssh_key and not self.tried_agent:
+                self.tried_agent = True
+                return pygit2.KeypairFromAgent(username_from_url or 'git')
+            token = get_github_token()
+            if token and allowed_types & pygit2.enums.CredentialType.USERPASS_PLAINTEXT:
+                return pygit2.UserPass('x-access-token', token)
+            raise pygit2.GitError(f"No usable credentials for {url}")
+        
+        def push_update_reference(self, refname, message):
+            if message:
+                raise pygit2.GitError(f"{refname} rejected: {message}")
 
 if __name__ == "__main__":
     toolbox = SimpleToolbox()
@@ -4,6 +4,7 @@ import json
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional
+from github_api import GIT_ENV, GIT_PUSH_TIMEOUT
 
 # Set page config at the very top
 st.set_page_config(
@@ -312,12 +313,19 @@ class SimpleToolbox:
                 'roles/cloudbuild.builds.builder'
             ]
             
+            # Everything but the role is the same for each binding, so build it once
+            binding_command = [
+                'gcloud',
+                'projects',
+                'add-iam-policy-binding',
+                project_id,
+                '--member',
+                f'serviceAccount:{service_account_email}',
+            ]
             for role in roles:
                 try:
                     st.info(f"🔐 Granting {role}...")
-                    subprocess.run(['gcloud', 'projects', 'add-iam-policy-binding', project_id,
-                                  '--member', f'serviceAccount:{service_account_email}',
-                                  '--role', role], 
+                    subprocess.run([*binding_command, '--role', role], 
                                  capture_output=True, text=True, check=True)
                     st.success(f"✅ Granted {role}")
                 except subprocess.CalledProcessError as e:
@@ -988,39 +996,31 @@ CMD ["streamlit", "run", "simple_toolbox.py", "--server.port=8501", "--server.ad
         try:
             st.info("📤 Pushing code to GitHub...")
             
-            # Check git status
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                 capture_output=True, text=True, check=True)
-            
-            if not result.stdout.strip():
-                st.info("ℹ️ No changes to commit - adding CI/CD files...")
-                # Force add CI/CD files even if no changes
-                subprocess.run(['git', 'add', '.github/', 'Dockerfile', 'requirements.txt'], check=True)
-            else:
-                st.info("📝 Adding all changes...")
-                subprocess.run(['git', 'add', '.'], check=True)
-            
-            # Commit with descriptive message
+            # Stage, commit only if something is staged, and push the current branch in
+            # one spawn; the message goes through the environment, so no shell quoting.
+            # exec hands the push bash's pid, so the timeout kill reaches it
             commit_msg = f"🚀 Add CI/CD pipeline and trigger deployment - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            subprocess.run(['git', 'commit', '-m', commit_msg], check=True)
-            
-            # Get current branch
-            branch_result = subprocess.run(['git', 'branch', '--show-current'], 
-                                         capture_output=True, text=True, check=True)
-            current_branch = branch_result.stdout.strip()
-            
-            st.info(f"📤 Pushing to branch: {current_branch}")
+            script = (
+                'git add . && '
+                '{ git diff --cached --quiet || git commit -q -m "$COMMIT_MSG"; } && '
+                'exec git push origin HEAD'
+            )
+            result = subprocess.run(['bash', '-c', script],
+                                    env={**GIT_ENV, 'COMMIT_MSG': commit_msg},
+                                    capture_output=True, text=True,
+                                    timeout=GIT_PUSH_TIMEOUT)
             
-            # Push to current branch
-            subprocess.run(['git', 'push', 'origin', current_branch], check=True)
+            if result.returncode != 0:
+                st.error(f"❌ Git operation failed: {result.stderr.strip()}")
+                return False
             
             st.success("🎉 Code pushed successfully!")
             st.info("🚀 CI/CD pipeline is now running!")
             
             return True
             
-        except subprocess.CalledProcessError as e:
-            st.error(f"❌ Git operation failed: {e}")
+        except subprocess.TimeoutExpired:
+            st.error(f"❌ Git push timed out after {GIT_PUSH_TIMEOUT}s")
             return False
         except Exception as e:
             st.error(f"❌ Failed to push code: {e}")
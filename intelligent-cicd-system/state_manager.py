@@ -4,9 +4,70 @@
 Central state management for the entire CI/CD toolbox workflow
 """
 
+import atexit
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 import streamlit as st
 
+# Default state for every phase, built once at import time. Values are
+# copied into st.session_state so sessions never share mutable containers.
+_DEFAULT_STATE = MappingProxyType({
+    # Phase 1: Authentication State
+    'auth_state': MappingProxyType({
+        'gcp_authenticated': False,
+        'github_authenticated': False,
+        'gcp_project': None,
+        'github_user': None
+    }),
+    
+    # Phase 2: Infrastructure State
+    'infrastructure_state': MappingProxyType({
+        'project_id': None,
+        'service_account_email': None,
+        'apis_enabled': [],
+        'wif_pool': None,
+        'wif_provider': None,
+        'artifact_registry': None,
+        'iam_configured': False,
+        'setup_complete': False
+    }),
+    
+    # Phase 3: Secrets State
+    'secrets_state': MappingProxyType({
+        'github_secrets': {},
+        'env_vars': {},
+        'secrets_extracted': False
+    }),
+    
+    # Phase 4: GitHub Setup State
+    'github_state': MappingProxyType({
+        'secrets_pushed': False,
+        'yaml_generated': False,
+        'setup_complete': False
+    }),
+    
+    # Phase 5: Pipeline State
+    'pipeline_state': MappingProxyType({
+        'committed': False,
+        'running': False,
+        'status': 'pending'
+    }),
+    
+    # Error State
+    'error_state': MappingProxyType({
+        'has_error': False,
+        'error_message': '',
+        'error_phase': None
+    })
+})
+
+# One worker pool for the whole process, shared by every session, so
+# abandoned sessions never leave idle threads behind.
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='cicd')
+atexit.register(_EXECUTOR.shutdown, wait=False)
+
 class StateManager:
     """Manages state across all phases of the CI/CD setup"""
     
@@ -15,63 +76,18 @@ class StateManager:
     
     def initialize_session_state(self):
         """Initialize all session state variables"""
-        # Phase 1: Authentication State
-        if 'auth_state' not in st.session_state:
-            st.session_state.auth_state = {
-                'gcp_authenticated': False,
-                'github_authenticated': False,
-                'gcp_project': None,
-                'github_user': None
-            }
-        
-        # Phase 2: Infrastructure State
-        if 'infrastructure_state' not in st.session_state:
-            st.session_state.infrastructure_state = {
-                'project_id': None,
-                'service_account_email': None,
-                'apis_enabled': [],
-                'wif_pool': None,
-                'wif_provider': None,
-                'artifact_registry': None,
-                'iam_configured': False,
-                'setup_complete': False
-            }
-        
-        # Phase 3: Secrets State
-        if 'secrets_state' not in st.session_state:
-            st.session_state.secrets_state = {
-                'github_secrets': {},
-                'env_vars': {},
-                'secrets_extracted': False
-            }
-        
-        # Phase 4: GitHub Setup State
-        if 'github_state' not in st.session_state:
-            st.session_state.github_state = {
-                'secrets_pushed': False,
-                'yaml_generated': False,
-                'setup_complete': False
-            }
-        
-        # Phase 5: Pipeline State
-        if 'pipeline_state' not in st.session_state:
-            st.session_state.pipeline_state = {
-                'committed': False,
-                'running': False,
-                'status': 'pending'
-            }
+        for key, defaults in _DEFAULT_STATE.items():
+            if key not in st.session_state:
+                st.session_state[key] = {
+                    name: copy.copy(value) for name, value in defaults.items()
+                }
         
         # Current Phase Tracking
-        if 'current_phase' not in st.session_state:
-            st.session_state.current_phase = 'authentication'
-        
-        # Error State
-        if 'error_state' not in st.session_state:
-            st.session_state.error_state = {
-                'has_error': False,
-                'error_message': '',
-                'error_phase': None
-            }
+        st.session_state.setdefault('current_phase', 'authentication')
+    
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Get the process-wide worker pool used for concurrent CLI calls"""
+        return _EXECUTOR
     
     def get_auth_state(self) -> Dict[str, Any]:
         """Get current authentication state"""
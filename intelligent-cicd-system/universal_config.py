@@ -7,6 +7,7 @@ Makes the toolbox work in any project without hardcoding
 import os
 import json
 import subprocess
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
@@ -29,8 +30,10 @@ class UniversalConfig:
     
     def save_config(self):
         """Save current configuration"""
+        # Serialize first and write once, so a failed encode cannot truncate the file
+        payload = json.dumps(self.config, indent=2)
         with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+            f.write(payload)
     
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -273,7 +276,6 @@ class UniversalConfig:
     
     def get_timestamp(self) -> str:
         """Get current timestamp"""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def get_deployment_config(self) -> Dict[str, Any]:
@@ -7,6 +7,7 @@ Simple ChatGPT-like interface with persistent chat memory
 import datetime
 import json
 import os
+from functools import lru_cache
 
 import streamlit as st
 
@@ -20,9 +21,11 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Simple custom CSS for brand colors only
-st.markdown(
-    """
+# Simple custom CSS for brand colors only. Kept as a module constant so the
+# string is built once per process; Streamlit drops any element that is not
+# re-emitted during a rerun, so it still has to be written on every run.
+# Whitespace is collapsed up front to shrink the per-rerun delta.
+_CSS = " ".join("""
 <style>
     /* Hide default Streamlit elements */
     #MainMenu {visibility: hidden;}
@@ -79,9 +82,39 @@ st.markdown(
         border-color: #667eea;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+""".split())
+
+# Chat bubble templates; the message text is still rendered as markdown.
+_USER_BUBBLE = """
+<div style="
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 1rem;
+    border-radius: 15px;
+    margin: 0.5rem 0 1rem 0;
+    text-align: right;
+">
+    {content}
+</div>
+"""
+
+_ASSISTANT_BUBBLE = """
+<div style="
+    background: #f8f9fa;
+    color: #333;
+    padding: 1rem;
+    border-radius: 15px;
+    margin: 0.5rem 0 1rem 0;
+    border-left: 4px solid #667eea;
+">
+    {content}
+</div>
+"""
+
+
+def _inject_css():
+    """Emit the brand stylesheet for the current run."""
+    st.markdown(_CSS, unsafe_allow_html=True)
 
 
 def initialize_chatbot():
@@ -155,6 +188,15 @@ def list_chat_sessions():
         return []
 
 
+@lru_cache(maxsize=256)
+def format_session_date(updated_at):
+    """Sidebar date for a session; cached because every rerun redraws the same list."""
+    try:
+        return datetime.datetime.fromisoformat(updated_at).strftime("%b %d, %H:%M")
+    except (TypeError, ValueError):
+        return "Unknown"
+
+
 def delete_chat_session(session_id):
     """Delete a chat session."""
     try:
@@ -177,14 +219,12 @@ def generate_chat_title(first_message):
 
 def main():
     """Main Streamlit application."""
+    _inject_css()
 
     # Initialize session state
-    if "current_session_id" not in st.session_state:
-        st.session_state.current_session_id = None
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    if "chat_title" not in st.session_state:
-        st.session_state.chat_title = "New Chat"
+    st.session_state.setdefault("current_session_id", None)
+    st.session_state.setdefault("messages", [])
+    st.session_state.setdefault("chat_title", "New Chat")
 
     # Simple header with brand colors
     st.markdown("---")
@@ -233,14 +273,7 @@ def main():
             for session in chat_sessions:
                 session_id = session["session_id"]
                 title = session["title"]
-                updated_at = session.get("updated_at", "")
-
-                # Format date
-                try:
-                    dt = datetime.datetime.fromisoformat(updated_at)
-                    date_str = dt.strftime("%b %d, %H:%M")
-                except:
-                    date_str = "Unknown"
+                date_str = format_session_date(session.get("updated_at", ""))
 
                 # Check if this is the active session
                 is_active = session_id == st.session_state.current_session_id
@@ -301,36 +334,14 @@ def main():
                 # User message with brand colors
                 st.markdown("**You:**")
                 st.markdown(
-                    f"""
-                <div style="
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 1rem;
-                    border-radius: 15px;
-                    margin: 0.5rem 0 1rem 0;
-                    text-align: right;
-                ">
-                    {message["content"]}
-                </div>
-                """,
+                    _USER_BUBBLE.format(content=message["content"]),
                     unsafe_allow_html=True,
                 )
             else:
                 # Assistant message
                 st.markdown("**Assistant:**")
                 st.markdown(
-                    f"""
-                <div style="
-                    background: #f8f9fa;
-                    color: #333;
-                    padding: 1rem;
-                    border-radius: 15px;
-                    margin: 0.5rem 0 1rem 0;
-                    border-left: 4px solid #667eea;
-                ">
-                    {message["response"]}
-                </div>
-                """,
+                    _ASSISTANT_BUBBLE.format(content=message["response"]),
                     unsafe_allow_html=True,
                 )
 
@@ -0,0 +1,78 @@
+"""
+Unit tests for intelligent-cicd-system/gcloud_env.py
+"""
+
+import os
+import sys
+
+# Add the CI/CD system directory to path for imports
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "intelligent-cicd-system",
+    ),
+)
+
+from gcloud_env import add_policy_bindings
+
+MEMBER = "serviceAccount:ci@project.iam.gserviceaccount.com"
+
+
+class TestAddPolicyBindings:
+    """Test cases for merging role bindings into an IAM policy"""
+
+    def test_adds_member_to_existing_role(self):
+        """Test a member is appended to a role that is already bound"""
+        policy = {"bindings": [{"role": "roles/run.admin", "members": ["user:a@b.c"]}]}
+
+        assert add_policy_bindings(policy, MEMBER, ["roles/run.admin"]) is True
+        assert policy["bindings"] == [
+            {"role": "roles/run.admin", "members": ["user:a@b.c", MEMBER]}
+        ]
+
+    def test_existing_member_is_unchanged(self):
+        """Test a role that already has the member needs no write"""
+        policy = {"bindings": [{"role": "roles/run.admin", "members": [MEMBER]}]}
+
+        assert add_policy_bindings(policy, MEMBER, ["roles/run.admin"]) is False
+        assert policy["bindings"] == [{"role": "roles/run.admin", "members": [MEMBER]}]
+
+    def test_adds_new_role(self):
+        """Test a role missing from the policy gets its own binding"""
+        policy = {"etag": "abc"}
+
+        assert add_policy_bindings(policy, MEMBER, ["roles/storage.admin"]) is True
+        assert policy["bindings"] == [
+            {"role": "roles/storage.admin", "members": [MEMBER]}
+        ]
+        assert policy["etag"] == "abc"
+
+    def test_conditional_binding_is_not_reused(self):
+        """Test a conditional binding for the role does not count as granted"""
+        conditional = {
+            "role": "roles/run.admin",
+            "members": [MEMBER],
+            "condition": {"title": "temporary"},
+        }
+        policy = {"bindings": [conditional]}
+
+        assert add_policy_bindings(policy, MEMBER, ["roles/run.admin"]) is True
+        assert policy["bindings"] == [
+            conditional,
+            {"role": "roles/run.admin", "members": [MEMBER]},
+        ]
+
+    def test_mixed_roles(self):
+        """Test only the roles that change are touched"""
+        policy = {"bindings": [{"role": "roles/run.admin", "members": [MEMBER]}]}
+
+        changed = add_policy_bindings(
+            policy, MEMBER, ["roles/run.admin", "roles/iam.serviceAccountUser"]
+        )
+
+        assert changed is True
+        assert policy["bindings"] == [
+            {"role": "roles/run.admin", "members": [MEMBER]},
+            {"role": "roles/iam.serviceAccountUser", "members": [MEMBER]},
+        ]
@@ -0,0 +1,91 @@
+"""
+Unit tests for the pure helpers in intelligent-cicd-system/intelligent_toolbox_v4.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# The toolbox module builds its Flask app at import time
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+# Add the CI/CD system directory to path for imports
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "intelligent-cicd-system",
+    ),
+)
+
+from intelligent_toolbox_v4 import parse_gh_account, read_head_branch, read_head_commit
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+OTHER_SHA = "fedcba9876543210fedcba9876543210fedcba98"
+
+
+class TestParseGhAccount:
+    """Test cases for reading the account from `gh auth status` output"""
+
+    def test_account_format(self):
+        """Test the 'account NAME' wording of newer gh releases"""
+        output = (
+            "github.com\n"
+            "  ✓ Logged in to github.com account octocat (keyring)\n"
+            "  - Active account: true\n"
+        )
+        assert parse_gh_account(output) == "octocat"
+
+    def test_as_format(self):
+        """Test the 'as NAME' wording of older gh releases"""
+        output = "github.com\n  ✓ Logged in to github.com as octocat (oauth_token)\n"
+        assert parse_gh_account(output) == "octocat"
+
+    def test_not_logged_in(self):
+        """Test output without a login yields None"""
+        output = "You are not logged into any GitHub hosts. Run gh auth login."
+        assert parse_gh_account(output) is None
+
+
+class TestReadHead:
+    """Test cases for resolving HEAD from the .git directory"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Minimal .git directory layout"""
+        (tmp_path / ".git" / "refs" / "heads").mkdir(parents=True)
+        return tmp_path
+
+    def test_loose_ref(self, repo):
+        """Test HEAD pointing at a loose branch ref"""
+        (repo / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (repo / ".git" / "refs" / "heads" / "main").write_text(SHA + "\n")
+
+        assert read_head_commit(str(repo)) == SHA
+        assert read_head_branch(str(repo)) == "main"
+
+    def test_packed_ref(self, repo):
+        """Test a branch that only exists in packed-refs"""
+        (repo / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (repo / ".git" / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            f"{OTHER_SHA} refs/heads/feature\n"
+            f"{SHA} refs/heads/main\n"
+        )
+
+        assert read_head_commit(str(repo)) == SHA
+        assert read_head_branch(str(repo)) == "main"
+
+    def test_detached_head(self, repo):
+        """Test a detached HEAD holding the SHA directly"""
+        (repo / ".git" / "HEAD").write_text(SHA + "\n")
+
+        assert read_head_commit(str(repo)) == SHA
+        assert read_head_branch(str(repo)) is None
+
+    def test_missing_repository(self, tmp_path):
+        """Test a directory without .git yields None"""
+        assert read_head_commit(str(tmp_path)) is None
+        assert read_head_branch(str(tmp_path)) is None
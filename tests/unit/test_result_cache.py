@@ -0,0 +1,37 @@
+"""
+Unit tests for intelligent-cicd-system/result_cache.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the CI/CD system directory to path for imports
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        "intelligent-cicd-system",
+    ),
+)
+
+from result_cache import make_key
+
+
+class TestMakeKey:
+    """Test cases for result cache keys"""
+
+    def test_stable_across_dict_order(self):
+        """Test dict key order does not change the key"""
+        assert make_key("analysis", {"a": 1, "b": 2}) == make_key(
+            "analysis", {"b": 2, "a": 1}
+        )
+
+    def test_differs_by_input(self):
+        """Test different inputs give different keys"""
+        assert make_key("analysis", {"a": 1}) != make_key("analysis", {"a": 2})
+        assert make_key("analysis", 1) != make_key("pipeline_details", 1)
+
+    def test_non_json_values(self):
+        """Test values JSON cannot encode fall back to their string form"""
+        assert make_key(Path("/tmp/project")) == make_key("/tmp/project")